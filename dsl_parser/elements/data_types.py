@@ -26,6 +26,7 @@ from dsl_parser.framework.elements import (
 from dsl_parser.framework.requirements import (
     Value,
     Requirement,
+    KeyPredicate,
     sibling_predicate)
 
 
@@ -157,8 +158,10 @@ class DataType(types.Type):
             Requirement('component_types',
                         multiple_results=True,
                         required=False,
-                        predicate=lambda source, target:
-                            target.name in source.direct_component_types),
+                        predicate=KeyPredicate(
+                            source_key=lambda source:
+                                source.direct_component_types,
+                            multiple_keys=True)),
             Value('super_type',
                   predicate=types.derived_from_predicate,
                   required=False)
@@ -184,6 +187,13 @@ class DataType(types.Type):
         for component in component_types:
             merged_component_types.update(component)
         self.component_types.update(merged_component_types)
+        result = self.resolve(
+            super_type, merged_component_types,
+            lambda: self._resolve(super_type, merged_component_types))
+        self.component_types[self.name] = result
+        return result
+
+    def _resolve(self, super_type, merged_component_types):
         result = self.build_dict_result()
         if constants.PROPERTIES not in result:
             result[constants.PROPERTIES] = {}
@@ -193,7 +203,6 @@ class DataType(types.Type):
                 overriding_schema=result.get('properties', {}),
                 data_types=merged_component_types)
         self.fix_properties(result)
-        self.component_types[self.name] = result
         return result
 
     def calculate_provided(self, **kwargs):
@@ -228,8 +237,7 @@ class DataTypes(types.Types):
 
 # source: element describing data_type name
 # target: data_type
-def _has_type(source, target):
-    return source.initial_value == target.name
+_has_type = KeyPredicate(source_key=lambda source: source.initial_value)
 
 
 SchemaPropertyType.requires[DataType] = [
@@ -14,17 +14,22 @@
 #    * limitations under the License.
 
 import os
-import urllib
+import sys
+import threading
+import time
+from multiprocessing.pool import ThreadPool
 
 import networkx as nx
 
 from dsl_parser import (exceptions,
                         constants,
                         version as _version,
+                        profiling,
                         utils)
 from dsl_parser.framework.elements import (Element,
                                            Leaf,
                                            List)
+from dsl_parser.framework.requirements import Requirement
 
 MERGE_NO_OVERRIDE = set([
     constants.INTERFACES,
@@ -37,6 +42,13 @@ MERGE_NO_OVERRIDE = set([
     constants.POLICY_TRIGGERS,
     constants.DATA_TYPES])
 
+# number of threads fetching imports concurrently, shared by all parses
+IMPORTS_FETCH_THREADS = 8
+
+_fetch_pool_lock = threading.Lock()
+# (process id, pool), forked processes do not inherit the pool threads
+_fetch_pool = None
+
 IGNORE = set([
     constants.DSL_DEFINITIONS,
     constants.IMPORTS,
@@ -69,7 +81,9 @@ class ImportsLoader(Element):
                    'blueprint_location',
                    'version',
                    'resolver',
-                   'validate_version']
+                   'validate_version',
+                   Requirement('yaml_cache', required=False),
+                   Requirement('observer', required=False)]
     }
 
     resource_base = None
@@ -89,9 +103,11 @@ class ImportsLoader(Element):
               blueprint_location,
               version,
               resolver,
-              validate_version):
+              validate_version,
+              yaml_cache,
+              observer):
         if blueprint_location:
-            blueprint_location = _dsl_location_to_url(
+            blueprint_location = utils.dsl_location_to_url(
                 dsl_location=blueprint_location,
                 resources_base_url=resources_base_url)
             slash_index = blueprint_location.rfind('/')
@@ -101,7 +117,9 @@ class ImportsLoader(Element):
                                 resources_base_url=resources_base_url,
                                 version=version,
                                 resolver=resolver,
-                                validate_version=validate_version)
+                                validate_version=validate_version,
+                                yaml_cache=yaml_cache,
+                                observer=observer)
 
     def calculate_provided(self, **kwargs):
         return {
@@ -109,51 +127,15 @@ class ImportsLoader(Element):
         }
 
 
-def _dsl_location_to_url(dsl_location, resources_base_url):
-    if dsl_location is not None:
-        dsl_location = _get_resource_location(dsl_location, resources_base_url)
-        if dsl_location is None:
-            ex = exceptions.DSLParsingLogicException(
-                30, "Failed converting dsl "
-                    "location to url: no suitable "
-                    "location found "
-                    "for dsl '{0}'"
-                    .format(dsl_location))
-            ex.failed_import = dsl_location
-            raise ex
-    return dsl_location
-
-
-def _get_resource_location(resource_name,
-                           resources_base_url,
-                           current_resource_context=None):
-    url_parts = resource_name.split(':')
-    if url_parts[0] in ['http', 'https', 'file', 'ftp']:
-        return resource_name
-
-    if os.path.exists(resource_name):
-        return 'file:{0}'.format(
-            urllib.pathname2url(os.path.abspath(resource_name)))
-
-    if current_resource_context:
-        candidate_url = current_resource_context[
-            :current_resource_context.rfind('/') + 1] + resource_name
-        if utils.url_exists(candidate_url):
-            return candidate_url
-
-    if resources_base_url:
-        return resources_base_url + resource_name
-
-    return None
-
-
 def _combine_imports(parsed_dsl_holder, dsl_location,
                      resources_base_url, version, resolver,
-                     validate_version):
+                     validate_version, yaml_cache=None, observer=None):
     ordered_imports = _build_ordered_imports(parsed_dsl_holder,
                                              dsl_location,
                                              resources_base_url,
-                                             resolver)
+                                             resolver,
+                                             yaml_cache,
+                                             observer)
     holder_result = parsed_dsl_holder.copy()
     version_key_holder, version_value_holder = parsed_dsl_holder.get_item(
         _version.VERSION)
@@ -165,32 +147,36 @@ def _combine_imports(parsed_dsl_holder, dsl_location,
             _validate_version(version.raw, import_url,
                               parsed_imported_dsl_holder)
         _merge_parsed_into_combined(holder_result, parsed_imported_dsl_holder)
-    holder_result.value[version_key_holder] = version_value_holder
+    holder_result.set_item(version_key_holder, version_value_holder)
     return holder_result
 
 
 def _build_ordered_imports(parsed_dsl_holder,
                            dsl_location,
                            resources_base_url,
-                           resolver):
+                           resolver,
+                           yaml_cache=None,
+                           observer=None):
 
     def location(value):
         return value or 'root'
 
     imports_graph = ImportsGraph()
     imports_graph.add(location(dsl_location), parsed_dsl_holder)
+    fetcher = _ImportsFetcher(resources_base_url=resources_base_url,
+                              resolver=resolver,
+                              yaml_cache=yaml_cache,
+                              observer=observer,
+                              retry_budget=_create_retry_budget(resolver),
+                              fetched=[location(dsl_location)])
 
     def _build_ordered_imports_recursive(_current_parsed_dsl_holder,
                                          _current_import):
-        imports_key_holder, imports_value_holder = _current_parsed_dsl_holder.\
-            get_item(constants.IMPORTS)
-        if not imports_value_holder:
-            return
-
-        for another_import in imports_value_holder.restore():
-            import_url = _get_resource_location(another_import,
-                                                resources_base_url,
-                                                _current_import)
+        import_locations = fetcher.prefetch(_current_parsed_dsl_holder,
+                                            _current_import)
+        for another_import, import_url in import_locations:
+            if isinstance(import_url, _Failure):
+                import_url.reraise()
             if import_url is None:
                 ex = exceptions.DSLParsingLogicException(
                     13, "Import failed: no suitable location found for "
@@ -201,20 +187,189 @@ def _build_ordered_imports(parsed_dsl_holder,
                 imports_graph.add_graph_dependency(import_url,
                                                    location(_current_import))
             else:
-                raw_imported_dsl = resolver.fetch_import(import_url)
-                imported_dsl_holder = utils.load_yaml(
-                    raw_yaml=raw_imported_dsl,
-                    error_message="Failed to parse import '{0}' (via '{1}')"
-                                  .format(another_import, import_url),
-                    filename=another_import)
+                imported_dsl_holder = fetcher.get(another_import, import_url)
                 imports_graph.add(import_url, imported_dsl_holder,
                                   location(_current_import))
                 _build_ordered_imports_recursive(imported_dsl_holder,
                                                  import_url)
-    _build_ordered_imports_recursive(parsed_dsl_holder, dsl_location)
+    try:
+        _build_ordered_imports_recursive(parsed_dsl_holder, dsl_location)
+    finally:
+        fetcher.close()
     return imports_graph.topological_sort()
 
 
+def _create_retry_budget(resolver):
+    # the reads of all imports of a parse share a single retry deadline,
+    # and hosts that could not be reached are not retried for the
+    # following imports
+    retry_policy = getattr(resolver, 'retry_policy', None)
+    if retry_policy is None:
+        return None
+    return retry_policy.budget()
+
+
+def _get_fetch_pool():
+    global _fetch_pool
+    with _fetch_pool_lock:
+        if _fetch_pool is None or _fetch_pool[0] != os.getpid():
+            _fetch_pool = (os.getpid(), ThreadPool(IMPORTS_FETCH_THREADS))
+        return _fetch_pool[1]
+
+
+class _Failure(object):
+
+    def __init__(self):
+        self.exc_info = sys.exc_info()
+
+    def reraise(self):
+        raise self.exc_info[0], self.exc_info[1], self.exc_info[2]
+
+
+class _ImportsFetcher(object):
+    """Fetches and loads imports on a thread pool ahead of the import tree
+    walk of ``_build_ordered_imports``.
+
+    Once an import is loaded, its own imports are fetched as well, so all
+    the imports of a level are fetched concurrently. The walk itself stays
+    serial: it gets each import in its usual order, and failures (of
+    locating, fetching or loading an import) are raised when the walk
+    reaches the failed import, as they would be without fetching ahead.
+    """
+
+    def __init__(self,
+                 resources_base_url,
+                 resolver,
+                 yaml_cache,
+                 observer,
+                 retry_budget=None,
+                 fetched=()):
+        self._resources_base_url = resources_base_url
+        self._resolver = resolver
+        # existence checks share the connection pools of the resolver
+        self._session = getattr(resolver, 'session', None)
+        # the fetch threads check for imports in the existence cache of
+        # the parse, which is open in the parsing thread
+        self._existence_cache = utils.current_url_existence_cache()
+        self._yaml_cache = yaml_cache
+        self._observer = observer
+        self._retry_budget = retry_budget
+        self._lock = threading.Lock()
+        self._closed = False
+        # import url -> async result of (another_import, raw, holder)
+        self._fetches = dict((import_url, None) for import_url in fetched)
+        # id(holder) -> (holder, import locations)
+        self._import_locations = {}
+
+    def prefetch(self, parsed_dsl_holder, current_import):
+        """Starts fetching the imports of ``parsed_dsl_holder`` and returns
+        their (import, location) pairs, where the location is a
+        ``_Failure`` if locating the import failed."""
+        with self._lock:
+            located = self._import_locations.get(id(parsed_dsl_holder))
+        if located is not None:
+            # already located (and fetched) by a fetch thread
+            return located[1]
+        _, imports_value_holder = parsed_dsl_holder.get_item(
+            constants.IMPORTS)
+        if not imports_value_holder:
+            return []
+        # the relative imports of a level are checked for together
+        utils.prefetch_url_exists(
+            [utils.relative_candidate_url(another_import, current_import)
+             for another_import in imports_value_holder.restore()
+             if isinstance(another_import, basestring)],
+            self._session,
+            self._existence_cache)
+        import_locations = []
+        for another_import in imports_value_holder.restore():
+            try:
+                import_url = utils.get_resource_location(
+                    another_import,
+                    self._resources_base_url,
+                    current_import,
+                    self._session,
+                    self._existence_cache)
+            except Exception:
+                import_url = _Failure()
+            import_locations.append((another_import, import_url))
+        with self._lock:
+            self._import_locations[id(parsed_dsl_holder)] = (
+                parsed_dsl_holder, import_locations)
+            if self._closed:
+                return import_locations
+            for another_import, import_url in import_locations:
+                if isinstance(import_url, basestring) and \
+                        import_url not in self._fetches:
+                    self._fetches[import_url] = _get_fetch_pool().apply_async(
+                        self._fetch, (another_import, import_url))
+        return import_locations
+
+    def get(self, another_import, import_url):
+        with self._lock:
+            fetch = self._fetches.get(import_url)
+        if fetch is None:
+            return self._load(another_import, import_url,
+                              self._fetch_raw(import_url))
+        fetched_import, raw_imported_dsl, imported_dsl_holder = fetch.get()
+        if isinstance(raw_imported_dsl, _Failure):
+            raw_imported_dsl.reraise()
+        if fetched_import != another_import or \
+                isinstance(imported_dsl_holder, _Failure):
+            # loaded under another name (which ends up in the holders and
+            # error messages), or failed to load
+            return self._load(another_import, import_url, raw_imported_dsl)
+        return imported_dsl_holder
+
+    def close(self):
+        """Cancels the fetches that have not started and waits for the
+        running ones to finish."""
+        with self._lock:
+            self._closed = True
+            fetches = [fetch for fetch in self._fetches.itervalues()
+                       if fetch is not None]
+        for fetch in fetches:
+            fetch.wait()
+
+    def _fetch(self, another_import, import_url):
+        if self._closed:
+            # the walk is over (it failed), nobody gets this import
+            return another_import, None, None
+        try:
+            raw_imported_dsl = self._fetch_raw(import_url)
+        except Exception:
+            return another_import, _Failure(), None
+        try:
+            imported_dsl_holder = self._load(another_import, import_url,
+                                             raw_imported_dsl)
+        except Exception:
+            return another_import, raw_imported_dsl, _Failure()
+        self.prefetch(imported_dsl_holder, import_url)
+        return another_import, raw_imported_dsl, imported_dsl_holder
+
+    def _fetch_raw(self, import_url):
+        start = time.time()
+        if self._retry_budget is None:
+            raw_imported_dsl = self._resolver.fetch_import(import_url)
+        else:
+            raw_imported_dsl = self._resolver.fetch_import(
+                import_url, retry_budget=self._retry_budget)
+        if self._observer:
+            self._observer.import_fetched(import_url, time.time() - start)
+        return raw_imported_dsl
+
+    def _load(self, another_import, import_url, raw_imported_dsl):
+        with profiling.timed_phase(self._observer,
+                                   profiling.PHASE_LOAD_YAML):
+            return utils.load_yaml(
+                raw_yaml=raw_imported_dsl,
+                error_message="Failed to parse import "
+                              "'{0}' (via '{1}')"
+                              .format(another_import, import_url),
+                filename=another_import,
+                cache=self._yaml_cache)
+
+
 def _validate_version(dsl_version,
                       import_url,
                       parsed_imported_dsl_holder):
@@ -239,7 +394,7 @@ def _merge_parsed_into_combined(combined_parsed_dsl_holder,
         if key_holder.value in IGNORE:
             pass
         elif key_holder.value not in combined_parsed_dsl_holder:
-            combined_parsed_dsl_holder.value[key_holder] = value_holder
+            combined_parsed_dsl_holder.set_item(key_holder, value_holder)
         elif key_holder.value in MERGE_NO_OVERRIDE:
             _, to_dict = combined_parsed_dsl_holder.get_item(key_holder.value)
             _merge_into_dict_or_throw_on_duplicate(
@@ -256,7 +411,7 @@ def _merge_into_dict_or_throw_on_duplicate(from_dict_holder, to_dict_holder,
                                            key_name):
     for key_holder, value_holder in from_dict_holder.value.iteritems():
         if key_holder.value not in to_dict_holder:
-            to_dict_holder.value[key_holder] = value_holder
+            to_dict_holder.set_item(key_holder, value_holder)
         else:
             raise exceptions.DSLParsingLogicException(
                 4, "Import failed: Could not merge '{0}' due to conflict "
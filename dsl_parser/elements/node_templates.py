@@ -13,9 +13,8 @@
 #    * See the License for the specific language governing permissions and
 #    * limitations under the License.
 
-import copy
-
 from dsl_parser import (exceptions,
+                        frozen,
                         utils,
                         constants)
 from dsl_parser.interfaces import interfaces_parser
@@ -24,7 +23,10 @@ from dsl_parser.elements import (node_types as _node_types,
                                  relationships as _relationships,
                                  operation as _operation,
                                  data_types as _data_types)
-from dsl_parser.framework.requirements import Value, Requirement
+from dsl_parser.framework.requirements import (Value,
+                                               Requirement,
+                                               KeyPredicate,
+                                               sibling_predicate)
 from dsl_parser.framework.elements import (DictElement,
                                            Element,
                                            Leaf,
@@ -53,14 +55,14 @@ class NodeTemplateProperties(Element):
 
     schema = Leaf(type=dict)
     requires = {
-        NodeTemplateType: [],
+        NodeTemplateType: [Value('node_type_name',
+                                 predicate=sibling_predicate)],
         _node_types.NodeTypes: [Value('node_types')],
         _data_types.DataTypes: [Value('data_types')]
     }
 
-    def parse(self, node_types, data_types):
+    def parse(self, node_type_name, node_types, data_types):
         properties = self.initial_value or {}
-        node_type_name = self.sibling(NodeTemplateType).value
         node_type = node_types[node_type_name]
         return utils.merge_schema_and_instance_properties(
             instance_properties=properties,
@@ -121,14 +123,13 @@ class NodeTemplateRelationshipProperties(Element):
 
     schema = Leaf(type=dict)
     requires = {
-        NodeTemplateRelationshipType: [],
+        NodeTemplateRelationshipType: [Value('relationship_type_name',
+                                             predicate=sibling_predicate)],
         _relationships.Relationships: [Value('relationships')],
         _data_types.DataTypes: [Value('data_types')]
     }
 
-    def parse(self, relationships, data_types):
-        relationship_type_name = self.sibling(
-            NodeTemplateRelationshipType).value
+    def parse(self, relationship_type_name, relationships, data_types):
         properties = self.initial_value or {}
         return utils.merge_schema_and_instance_properties(
             instance_properties=properties,
@@ -170,12 +171,17 @@ class NodeTemplateInstances(DictElement):
             return self.initial_value
 
 
-def _node_template_relationship_type_predicate(source, target):
-    try:
-        return (source.child(NodeTemplateRelationshipType).initial_value ==
-                target.name)
-    except exceptions.DSLParsingElementMatchException:
-        return False
+def _child_initial_value(element_type):
+    def key(source):
+        try:
+            return source.child(element_type).initial_value
+        except exceptions.DSLParsingElementMatchException:
+            return None
+    return key
+
+
+_node_template_relationship_type_predicate = KeyPredicate(
+    source_key=_child_initial_value(NodeTemplateRelationshipType))
 
 
 class NodeTemplateRelationship(Element):
@@ -256,20 +262,18 @@ class NodeTemplateRelationships(Element):
         }
 
 
-def _node_template_related_nodes_predicate(source, target):
-    if source.name == target.name:
-        return False
+def _related_node_template_names(source):
     targets = source.descendants(NodeTemplateRelationshipTarget)
-    relationship_targets = [e.initial_value for e in targets]
-    return target.name in relationship_targets
+    return [e.initial_value for e in targets
+            if e.initial_value != source.name]
 
 
-def _node_template_node_type_predicate(source, target):
-    try:
-        return (source.child(NodeTemplateType).initial_value ==
-                target.name)
-    except exceptions.DSLParsingElementMatchException:
-        return False
+_node_template_related_nodes_predicate = KeyPredicate(
+    source_key=_related_node_template_names,
+    multiple_keys=True)
+
+_node_template_node_type_predicate = KeyPredicate(
+    source_key=_child_initial_value(NodeTemplateType))
 
 
 class NodeTemplate(Element):
@@ -282,11 +286,12 @@ class NodeTemplate(Element):
         'properties': NodeTemplateProperties,
     }
     requires = {
-        'inputs': [Requirement('resource_base', required=False)],
+        'inputs': [Requirement('resource_base', required=False),
+                   Requirement('existence_cache', required=False)],
         'self': [Value('related_node_templates',
                        predicate=_node_template_related_nodes_predicate,
                        multiple_results=True)],
-        _plugins.Plugins: [Value('plugins')],
+        _plugins.Plugins: [Value('plugins'), Requirement('plugins_index')],
         _node_types.NodeType: [
             Value('node_type',
                   predicate=_node_template_node_type_predicate)],
@@ -297,34 +302,38 @@ class NodeTemplate(Element):
               node_type,
               host_types,
               plugins,
+              plugins_index,
               resource_base,
+              existence_cache,
               related_node_templates):
         node = self.build_dict_result()
+        node[constants.RELATIONSHIPS] = [
+            dict(relationship)
+            for relationship in node[constants.RELATIONSHIPS]]
         node.update({
             'name': self.name,
             'id': self.name,
             constants.TYPE_HIERARCHY: node_type[constants.TYPE_HIERARCHY]
         })
 
-        node[constants.INTERFACES] = interfaces_parser.\
-            merge_node_type_and_node_template_interfaces(
-                node_type_interfaces=node_type[constants.INTERFACES],
-                node_template_interfaces=node[constants.INTERFACES])
-
-        node['operations'] = _process_operations(
-            partial_error_message="in node '{0}' of type '{1}'"
-                                  .format(node['id'], node['type']),
-            interfaces=node[constants.INTERFACES],
-            plugins=plugins,
-            error_code=10,
-            resource_base=resource_base)
+        node[constants.INTERFACES], node['operations'] = \
+            _merge_and_process_interfaces(
+                node=node,
+                node_type=node_type,
+                plugins=plugins,
+                resource_base=resource_base,
+                cache=_interfaces_cache(self.parent()),
+                plugins_index=plugins_index,
+                existence_cache=existence_cache)
 
         node_name_to_node = dict((node['id'], node)
                                  for node in related_node_templates)
         _post_process_node_relationships(processed_node=node,
                                          node_name_to_node=node_name_to_node,
                                          plugins=plugins,
-                                         resource_base=resource_base)
+                                         resource_base=resource_base,
+                                         plugins_index=plugins_index,
+                                         existence_cache=existence_cache)
 
         contained_in = self.child(NodeTemplateRelationships).provided[
             'contained_in']
@@ -339,10 +348,61 @@ class NodeTemplate(Element):
         return node
 
 
+def _interfaces_cache(node_templates):
+    # shared by the node templates of a parse
+    cache = node_templates.interfaces_cache
+    if cache is None:
+        cache = node_templates.interfaces_cache = {}
+    return cache
+
+
+def _merge_and_process_interfaces(node,
+                                  node_type,
+                                  plugins,
+                                  resource_base,
+                                  cache,
+                                  plugins_index=None,
+                                  existence_cache=None):
+    # node templates of the same type declaring the same interfaces share
+    # their (read only) merged interfaces and operations
+    node_type_interfaces = node_type[constants.INTERFACES]
+    try:
+        key = (node['type'],
+               utils.canonical_key(node[constants.INTERFACES]),
+               resource_base)
+        entry = cache.get(key)
+    except TypeError:
+        # unhashable values in the interfaces
+        key = entry = None
+    if entry is not None and entry[0] is node_type_interfaces and \
+            entry[1] is plugins:
+        return entry[2], entry[3]
+
+    interfaces = frozen.freeze(interfaces_parser.
+                               merge_node_type_and_node_template_interfaces(
+                                   node_type_interfaces=node_type_interfaces,
+                                   node_template_interfaces=node[
+                                       constants.INTERFACES]))
+    operations = frozen.freeze(_process_operations(
+        partial_error_message="in node '{0}' of type '{1}'"
+                              .format(node['id'], node['type']),
+        interfaces=interfaces,
+        plugins=plugins,
+        error_code=10,
+        resource_base=resource_base,
+        plugins_index=plugins_index,
+        existence_cache=existence_cache))
+    if key is not None:
+        cache[key] = (node_type_interfaces, plugins, interfaces, operations)
+    return interfaces, operations
+
+
 def _post_process_node_relationships(processed_node,
                                      node_name_to_node,
                                      plugins,
-                                     resource_base):
+                                     resource_base,
+                                     plugins_index=None,
+                                     existence_cache=None):
     for relationship in processed_node[constants.RELATIONSHIPS]:
         target_node = node_name_to_node[relationship['target_id']]
         _process_node_relationships_operations(
@@ -351,21 +411,27 @@ def _post_process_node_relationships(processed_node,
             operations_attribute='source_operations',
             node_for_plugins=processed_node,
             plugins=plugins,
-            resource_base=resource_base)
+            resource_base=resource_base,
+            plugins_index=plugins_index,
+            existence_cache=existence_cache)
         _process_node_relationships_operations(
             relationship=relationship,
             interfaces_attribute='target_interfaces',
             operations_attribute='target_operations',
             node_for_plugins=target_node,
             plugins=plugins,
-            resource_base=resource_base)
+            resource_base=resource_base,
+            plugins_index=plugins_index,
+            existence_cache=existence_cache)
 
 
 def _process_operations(partial_error_message,
                         interfaces,
                         plugins,
                         error_code,
-                        resource_base):
+                        resource_base,
+                        plugins_index=None,
+                        existence_cache=None):
     operations = {}
     for interface_name, interface in interfaces.items():
         interface_operations = \
@@ -376,7 +442,9 @@ def _process_operations(partial_error_message,
                 partial_error_message=(
                     "In interface '{0}' {1}".format(interface_name,
                                                     partial_error_message)),
-                resource_base=resource_base)
+                resource_base=resource_base,
+                plugins_index=plugins_index,
+                existence_cache=existence_cache)
         for operation in interface_operations:
             operation_name = operation.pop('name')
             if operation_name in operations:
@@ -398,7 +466,9 @@ def _process_node_relationships_operations(relationship,
                                            operations_attribute,
                                            node_for_plugins,
                                            plugins,
-                                           resource_base):
+                                           resource_base,
+                                           plugins_index=None,
+                                           existence_cache=None):
     partial_error_message = "in relationship of type '{0}' in node '{1}'" \
         .format(relationship['type'],
                 node_for_plugins['id'])
@@ -408,7 +478,9 @@ def _process_node_relationships_operations(relationship,
         interfaces=relationship[interfaces_attribute],
         plugins=plugins,
         error_code=19,
-        resource_base=resource_base)
+        resource_base=resource_base,
+        plugins_index=plugins_index,
+        existence_cache=existence_cache)
 
     relationship[operations_attribute] = operations
 
@@ -417,6 +489,8 @@ class NodeTemplates(Element):
 
     required = True
     schema = Dict(type=NodeTemplate)
+    # merged interfaces and operations of node templates
+    interfaces_cache = None
     requires = {
         _plugins.Plugins: [Value('plugins')],
         _node_types.NodeTypes: ['host_types']
@@ -427,7 +501,7 @@ class NodeTemplates(Element):
     ]
 
     def parse(self, host_types, plugins):
-        processed_nodes = dict((node.name, node.value)
+        processed_nodes = dict((node.name, dict(node.value))
                                for node in self.children())
         _process_nodes_plugins(
             processed_nodes=processed_nodes,
@@ -463,24 +537,33 @@ def _process_nodes_plugins(processed_nodes,
         for rel in node['relationships']:
             node_operations.append(rel['source_operations'])
             nodes_operations[rel['target_id']].append(rel['target_operations'])
+    # (plugin name, executor) -> plugin, shared by all the nodes
+    plugin_records = {}
     for node_name, node in processed_nodes.iteritems():
         node[constants.PLUGINS] = _get_plugins_from_operations(
             operations_lists=nodes_operations[node_name],
-            processed_plugins=plugins)
+            processed_plugins=plugins,
+            plugin_records=plugin_records)
+
+    # host id -> nodes contained in the host (including the host itself)
+    hosted_nodes = {}
+    for node in processed_nodes.itervalues():
+        host_id = node.get('host_id')
+        if host_id is not None:
+            hosted_nodes.setdefault(host_id, []).append(node)
 
     for node in processed_nodes.itervalues():
         # set plugins_to_install property for nodes
         if node['type'] in host_types:
             plugins_to_install = {}
-            for another_node in processed_nodes.itervalues():
-                # going over all other nodes, to accumulate plugins
-                # from different nodes whose host is the current node
-                if another_node.get('host_id') == node['id']:
-                    # ok to override here since we assume it is the same plugin
-                    for plugin in another_node[constants.PLUGINS]:
-                        if plugin[constants.PLUGIN_EXECUTOR_KEY] \
-                                == constants.HOST_AGENT:
-                            plugins_to_install[plugin['name']] = plugin
+            # accumulate plugins from the nodes whose host is the
+            # current node
+            for hosted_node in hosted_nodes.get(node['id'], []):
+                # ok to override here since we assume it is the same plugin
+                for plugin in hosted_node[constants.PLUGINS]:
+                    if plugin[constants.PLUGIN_EXECUTOR_KEY] \
+                            == constants.HOST_AGENT:
+                        plugins_to_install[plugin['name']] = plugin
             node[constants.PLUGINS_TO_INSTALL] = plugins_to_install.values()
 
         # set deployment_plugins_to_install property for nodes
@@ -496,7 +579,12 @@ def _process_nodes_plugins(processed_nodes,
 
 
 def _get_plugins_from_operations(operations_lists,
-                                 processed_plugins):
+                                 processed_plugins,
+                                 plugin_records=None):
+    # plugin records are read only, so they are shared between the nodes
+    # using the same plugin with the same executor
+    if plugin_records is None:
+        plugin_records = {}
     plugins = {}
     for operations in operations_lists:
         for operation in operations.values():
@@ -508,9 +596,13 @@ def _get_plugins_from_operations(operations_lists,
             operation_executor = operation['executor']
             plugin_key = (plugin_name, operation_executor)
             if plugin_key not in plugins:
-                plugin = copy.deepcopy(plugin)
-                plugin['executor'] = operation_executor
-                plugins[plugin_key] = plugin
+                plugin_record = plugin_records.get(plugin_key)
+                if plugin_record is None:
+                    plugin_record = dict(plugin)
+                    plugin_record['executor'] = operation_executor
+                    plugin_record = plugin_records[plugin_key] = \
+                        frozen.freeze(plugin_record)
+                plugins[plugin_key] = plugin_record
     return plugins.values()
 
 
@@ -39,6 +39,11 @@ class NodeType(types.Type):
     }
 
     def parse(self, super_type, data_types):
+        return self.resolve(
+            super_type, data_types,
+            lambda: self._resolve(super_type, data_types))
+
+    def _resolve(self, super_type, data_types):
         node_type = self.build_dict_result()
         if not node_type.get('derived_from'):
             node_type.pop('derived_from', None)
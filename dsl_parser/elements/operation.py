@@ -19,6 +19,7 @@ from dsl_parser import (constants,
                         exceptions,
                         utils)
 from dsl_parser.elements import (data_types,
+                                 plugins as _plugins,
                                  version as _version)
 from dsl_parser.framework.elements import (DictElement,
                                            Element,
@@ -176,13 +177,19 @@ def process_interface_operations(
         plugins,
         error_code,
         partial_error_message,
-        resource_base):
+        resource_base,
+        plugins_index=None,
+        existence_cache=None):
+    if plugins_index is None:
+        plugins_index = _plugins.index_plugins(plugins)
     return [process_operation(plugins=plugins,
                               operation_name=operation_name,
                               operation_content=operation_content,
                               error_code=error_code,
                               partial_error_message=partial_error_message,
-                              resource_base=resource_base)
+                              resource_base=resource_base,
+                              plugins_index=plugins_index,
+                              existence_cache=existence_cache)
             for operation_name, operation_content in interface.items()]
 
 
@@ -193,7 +200,16 @@ def process_operation(
         error_code,
         partial_error_message,
         resource_base,
-        is_workflows=False):
+        is_workflows=False,
+        plugins_index=None,
+        existence_cache=None):
+    """Processes an operation (or workflow) mapping against ``plugins``,
+    whose ``plugins_index`` (see ``plugins.index_plugins``) is provided by
+    the plugins element of a parse.
+
+    Resources are checked for in the ``existence_cache`` of the parse,
+    which is passed explicitly as elements may be processed in other
+    threads than the parsing thread."""
     payload_field_name = 'parameters' if is_workflows else 'inputs'
     mapping_field_name = 'mapping' if is_workflows else 'implementation'
     operation_mapping = operation_content[mapping_field_name]
@@ -218,8 +234,9 @@ def process_operation(
                 max_retries=None,
                 retry_interval=None)
 
-    candidate_plugins = [p for p in plugins.keys()
-                         if operation_mapping.startswith('{0}.'.format(p))]
+    if plugins_index is None:
+        plugins_index = _plugins.index_plugins(plugins)
+    candidate_plugins = _mapping_plugins(plugins_index, operation_mapping)
     if candidate_plugins:
         if len(candidate_plugins) > 1:
             raise exceptions.DSLParsingLogicException(
@@ -243,7 +260,9 @@ def process_operation(
                 executor=operation_executor,
                 max_retries=operation_max_retries,
                 retry_interval=operation_retry_interval)
-    elif resource_base and _resource_exists(resource_base, operation_mapping):
+    elif resource_base and _resource_exists(resource_base,
+                                            operation_mapping,
+                                            existence_cache):
         operation_payload = copy.deepcopy(operation_payload or {})
         if constants.SCRIPT_PATH_PROPERTY in operation_payload:
             message = "Cannot define '{0}' property in '{1}' for {2} '{3}'" \
@@ -305,8 +324,77 @@ def process_operation(
         raise exceptions.DSLParsingLogicException(error_code, error_message)
 
 
-def _resource_exists(resource_base, resource_name):
-    return utils.url_exists('{0}/{1}'.format(resource_base, resource_name))
+def _mapping_plugins(plugins_index, operation_mapping):
+    """Returns the names of the indexed plugins that are a dotted prefix of
+    ``operation_mapping``, in the order of the plugins dict."""
+    candidate_plugins = []
+    dot_index = operation_mapping.find('.')
+    while dot_index != -1:
+        prefix = operation_mapping[:dot_index]
+        if prefix in plugins_index:
+            candidate_plugins.append(prefix)
+        dot_index = operation_mapping.find('.', dot_index + 1)
+    if len(candidate_plugins) > 1:
+        candidate_plugins.sort(key=plugins_index.get)
+    return candidate_plugins
+
+
+def _resource_exists(resource_base, resource_name, existence_cache=None):
+    return utils.url_exists('{0}/{1}'.format(resource_base, resource_name),
+                            cache=existence_cache)
+
+
+def prefetch_resource_exists(blueprint_holder,
+                             resource_base,
+                             session=None,
+                             existence_cache=None):
+    """Checks for the resources of all the operations and workflows of the
+    blueprint that are not mapped to a plugin at once, so processing them
+    finds the results in the open existence cache."""
+    if not resource_base or \
+            resource_base.split(':')[0] not in ['http', 'https']:
+        # other resources are checked for locally
+        return
+    blueprint = blueprint_holder.restore()
+    if not isinstance(blueprint, dict):
+        return
+    plugins = blueprint.get(constants.PLUGINS)
+    plugin_prefixes = tuple('{0}.'.format(p) for p in plugins
+                            if isinstance(p, basestring)) \
+        if isinstance(plugins, dict) else ()
+    mappings = set()
+
+    def add_mapping(operation, mapping_field_name):
+        if isinstance(operation, dict):
+            operation = operation.get(mapping_field_name)
+        if operation and isinstance(operation, basestring) and \
+                not operation.startswith(plugin_prefixes):
+            mappings.add(operation)
+
+    def collect(value):
+        if isinstance(value, dict):
+            for key, item in value.iteritems():
+                if key in ['interfaces', 'source_interfaces',
+                           'target_interfaces'] and isinstance(item, dict):
+                    for interface in item.itervalues():
+                        if isinstance(interface, dict):
+                            for operation in interface.itervalues():
+                                add_mapping(operation, 'implementation')
+                else:
+                    collect(item)
+        elif isinstance(value, list):
+            for item in value:
+                collect(item)
+
+    collect(blueprint)
+    workflows = blueprint.get(constants.WORKFLOWS)
+    if isinstance(workflows, dict):
+        for workflow in workflows.itervalues():
+            add_mapping(workflow, 'mapping')
+    utils.prefetch_url_exists(
+        ['{0}/{1}'.format(resource_base, mapping) for mapping in mappings],
+        session,
+        existence_cache)
 
 
 def _operation(name,
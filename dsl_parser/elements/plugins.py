@@ -133,3 +133,14 @@ class Plugin(DictElement):
 class Plugins(DictElement):
 
     schema = Dict(type=Plugin)
+    provides = ['plugins_index']
+
+    def calculate_provided(self):
+        return {'plugins_index': index_plugins(self.value)}
+
+
+def index_plugins(plugins):
+    """Returns the position of each plugin name in the ``plugins`` dict,
+    which operation mappings are matched against."""
+    return dict((plugin_name, position)
+                for position, plugin_name in enumerate(plugins))
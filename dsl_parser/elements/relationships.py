@@ -33,15 +33,32 @@ class Relationship(types.Type):
         'target_interfaces': operation.NodeTypeInterfaces,
     }
     requires = {
-        'inputs': [Requirement('resource_base', required=False)],
-        _plugins.Plugins: [Value('plugins')],
+        'inputs': [Requirement('resource_base', required=False),
+                   Requirement('existence_cache', required=False)],
+        _plugins.Plugins: [Value('plugins'), Requirement('plugins_index')],
         'self': [Value('super_type',
                        predicate=types.derived_from_predicate,
                        required=False)],
         _data_types.DataTypes: [Value('data_types')]
     }
 
-    def parse(self, super_type, plugins, resource_base, data_types):
+    def parse(self, super_type, plugins, plugins_index, resource_base,
+              existence_cache, data_types):
+        relationship_type = self.resolve(
+            super_type, data_types,
+            lambda: self._resolve(super_type, data_types))
+        # the operations are validated on every parse, as they depend on
+        # the plugins and on the resources of the blueprint
+        _validate_relationship_fields(
+            rel_obj=relationship_type,
+            plugins=plugins,
+            rel_name=self.name,
+            resource_base=resource_base,
+            plugins_index=plugins_index,
+            existence_cache=existence_cache)
+        return relationship_type
+
+    def _resolve(self, super_type, data_types):
         relationship_type = self.build_dict_result()
         if not relationship_type.get('derived_from'):
             relationship_type.pop('derived_from', None)
@@ -59,11 +76,6 @@ class Relationship(types.Type):
                         overriding_interfaces=relationship_type[interfaces],
                         overridden_interfaces=super_type[interfaces])
 
-        _validate_relationship_fields(
-            rel_obj=relationship_type,
-            plugins=plugins,
-            rel_name=relationship_type_name,
-            resource_base=resource_base)
         relationship_type['name'] = relationship_type_name
         relationship_type[
             constants.TYPE_HIERARCHY] = self.create_type_hierarchy(super_type)
@@ -76,7 +88,8 @@ class Relationships(types.Types):
     schema = Dict(type=Relationship)
 
 
-def _validate_relationship_fields(rel_obj, plugins, rel_name, resource_base):
+def _validate_relationship_fields(rel_obj, plugins, rel_name, resource_base,
+                                  plugins_index=None, existence_cache=None):
     for interfaces in [constants.SOURCE_INTERFACES,
                        constants.TARGET_INTERFACES]:
         for interface_name, interface in rel_obj[interfaces].items():
@@ -85,4 +98,6 @@ def _validate_relationship_fields(rel_obj, plugins, rel_name, resource_base):
                 plugins=plugins,
                 error_code=19,
                 partial_error_message="Relationship '{0}'".format(rel_name),
-                resource_base=resource_base)
+                resource_base=resource_base,
+                plugins_index=plugins_index,
+                existence_cache=existence_cache)
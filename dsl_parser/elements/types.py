@@ -13,18 +13,120 @@
 #    * See the License for the specific language governing permissions and
 #    * limitations under the License.
 
-from dsl_parser import exceptions
+import collections
+import itertools
+import threading
+
+from dsl_parser import (exceptions,
+                        frozen,
+                        utils)
 from dsl_parser.framework.elements import (DictElement,
                                            Element,
                                            Leaf)
+from dsl_parser.framework.requirements import KeyPredicate
+
+RESOLVED_TYPES_CACHE_SIZE = 1024
+
+
+class ResolvedTypesCache(object):
+    """Process wide LRU cache of resolved types.
+
+    Each cached type has a token, which stands for the type (and so for its
+    whole ancestor chain) in the keys of the types resolved from it, keeping
+    the keys small however deep the type hierarchy is. Resolved types are
+    read only, so they are shared between parses.
+    """
+
+    def __init__(self, max_size=RESOLVED_TYPES_CACHE_SIZE):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._tokens = itertools.count()
+        # key -> (token, resolved type), least recently used first
+        self._entries = collections.OrderedDict()
+        # id of a cached resolved type -> its token
+        self._entry_tokens = {}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            self._entries[key] = entry
+            return entry[1]
+
+    def put(self, key, resolved_type):
+        """Caches ``resolved_type`` under ``key`` and returns its read only
+        version, which should be used in place of ``resolved_type``."""
+        resolved_type = frozen.freeze(resolved_type)
+        with self._lock:
+            if key in self._entries:
+                # resolved concurrently
+                return self._entries[key][1]
+            if id(resolved_type) in self._entry_tokens:
+                return resolved_type
+            token = next(self._tokens)
+            self._entries[key] = (token, resolved_type)
+            self._entry_tokens[id(resolved_type)] = token
+            while len(self._entries) > self.max_size:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                del self._entry_tokens[id(evicted)]
+        return resolved_type
+
+    def token(self, resolved_type):
+        """Returns the token of ``resolved_type`` if it is cached, or None.
+        """
+        with self._lock:
+            return self._entry_tokens.get(id(resolved_type))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._entry_tokens.clear()
+
+
+resolved_types_cache = ResolvedTypesCache()
 
 
 class Types(DictElement):
-    pass
+
+    # the last dependencies passed to the types of a parse and their key,
+    # the same dependencies (e.g. the data types) are usually passed to
+    # all of them
+    dependencies_key = (None, None)
 
 
 class Type(Element):
 
+    def resolve(self, super_type, dependencies, resolve_type):
+        """Returns the type resolved by ``resolve_type()``.
+
+        The resolved type is taken from the process wide cache if this type
+        was already resolved with the same definition, ``super_type`` and
+        ``dependencies``, a dict of the other resolved types it depends on.
+        """
+        cache = resolved_types_cache
+        super_token = None
+        if super_type:
+            super_token = cache.token(super_type)
+            if super_token is None:
+                return resolve_type()
+        dependencies_key = _get_dependencies_key(self.parent(), dependencies)
+        if dependencies_key is None:
+            return resolve_type()
+        try:
+            key = (type(self),
+                   self.name,
+                   utils.canonical_key(self.initial_value),
+                   super_token,
+                   dependencies_key)
+            resolved_type = cache.get(key)
+        except TypeError:
+            # unhashable values in the definition
+            return resolve_type()
+        if resolved_type is None:
+            resolved_type = cache.put(key, resolve_type())
+        return resolved_type
+
     def create_type_hierarchy(self, super_type):
         if super_type:
             type_hierarchy = super_type['type_hierarchy'][:]
@@ -35,8 +137,10 @@ class Type(Element):
 
     @staticmethod
     def fix_properties(value):
-        for key, value in value['properties'].iteritems():
-            value.pop('initial_default', None)
+        value['properties'] = dict(
+            (key, dict((k, v) for k, v in prop.iteritems()
+                       if k != 'initial_default'))
+            for key, prop in value['properties'].iteritems())
 
 
 class DerivedFrom(Element):
@@ -73,9 +177,30 @@ class DataTypeDerivedFrom(DerivedFrom):
     descriptor = 'data type'
 
 
-def derived_from_predicate(source, target):
+def _derived_from(source):
     try:
-        derived_from = source.child(DerivedFrom).initial_value
-        return derived_from and derived_from == target.name
+        return source.child(DerivedFrom).initial_value or None
     except exceptions.DSLParsingElementMatchException:
-        return False
+        return None
+
+
+derived_from_predicate = KeyPredicate(source_key=_derived_from)
+
+
+def _get_dependencies_key(types, dependencies):
+    if not dependencies:
+        return frozenset()
+    last_dependencies, key = types.dependencies_key
+    if last_dependencies is dependencies:
+        return key
+    tokens = []
+    for name, resolved_type in dependencies.iteritems():
+        token = resolved_types_cache.token(resolved_type)
+        if token is None:
+            key = None
+            break
+        tokens.append((name, token))
+    else:
+        key = frozenset(tokens)
+    types.dependencies_key = (dependencies, key)
+    return key
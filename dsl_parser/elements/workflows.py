@@ -40,11 +40,12 @@ class Workflow(Element):
         }
     ]
     requires = {
-        'inputs': [Requirement('resource_base', required=False)],
-        _plugins.Plugins: [Value('plugins')]
+        'inputs': [Requirement('resource_base', required=False),
+                   Requirement('existence_cache', required=False)],
+        _plugins.Plugins: [Value('plugins'), Requirement('plugins_index')]
     }
 
-    def parse(self, plugins, resource_base):
+    def parse(self, plugins, plugins_index, resource_base, existence_cache):
         if isinstance(self.initial_value, str):
             operation_content = {'mapping': self.initial_value,
                                  'parameters': {}}
@@ -57,7 +58,9 @@ class Workflow(Element):
             error_code=21,
             partial_error_message='',
             resource_base=resource_base,
-            is_workflows=True)
+            is_workflows=True,
+            plugins_index=plugins_index,
+            existence_cache=existence_cache)
 
 
 class Workflows(DictElement):
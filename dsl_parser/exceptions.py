@@ -84,3 +84,6 @@ ERROR_CODE_DSL_DEFINITIONS_VERSION_MISMATCH = 102
 ERROR_UNKNOWN_TYPE = 103
 ERROR_INVALID_TYPE_NAME = 104
 ERROR_VALUE_DOES_NOT_MATCH_TYPE = 105
+# 106 (undefined property) and 107 (missing property) are raised as
+# literals by the property merging in utils and interfaces.utils
+ERROR_CODE_ILLEGAL_VALUE_MODIFICATION = 108
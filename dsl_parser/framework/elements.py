@@ -13,10 +13,10 @@
 #    * See the License for the specific language governing permissions and
 #    * limitations under the License.
 
-import copy
 from StringIO import StringIO
 
 from dsl_parser import exceptions
+from dsl_parser import frozen
 from dsl_parser import holder
 from dsl_parser import version as _version
 
@@ -57,6 +57,7 @@ class Element(object):
         self.context = context
         initial_value = holder.Holder.of(initial_value)
         self.initial_value_holder = initial_value
+        # restored values are read only and shared with the parent's
         self._initial_value = initial_value.restore()
         self.start_line = initial_value.start_line
         self.start_column = initial_value.start_column
@@ -71,6 +72,10 @@ class Element(object):
         self.name_end_column = name.end_column
         self._parsed_value = UNPARSED
         self._provided = None
+        # tree references, assigned by the context that owns this element
+        self._parent_element = None
+        self._child_elements = []
+        self._path = None
 
     def __str__(self):
         message = StringIO()
@@ -101,7 +106,9 @@ class Element(object):
 
     @property
     def initial_value(self):
-        return copy.deepcopy(self._initial_value)
+        # values are frozen so they can be handed out without copying,
+        # use copy.deepcopy to get a modifiable copy
+        return self._initial_value
 
     @property
     def value(self):
@@ -109,38 +116,39 @@ class Element(object):
             raise exceptions.DSLParsingSchemaAPIException(
                 exceptions.ERROR_CODE_ILLEGAL_VALUE_ACCESS,
                 'Cannot access element value before parsing')
-        return copy.deepcopy(self._parsed_value)
+        return self._parsed_value
 
     @value.setter
     def value(self, val):
-        self._parsed_value = val
+        self._parsed_value = frozen.freeze(val)
 
     def calculate_provided(self, **kwargs):
         return {}
 
     @property
     def provided(self):
-        return copy.deepcopy(self._provided)
+        return self._provided
 
     @provided.setter
     def provided(self, value):
-        self._provided = value
+        self._provided = frozen.freeze(value)
 
     @property
     def path(self):
-        elements = [str(e.name) for e in self.context.ancestors_iter(self)]
-        if elements:
-            elements.pop()
-        elements.reverse()
-        elements.append(str(self.name))
-        return '.'.join(elements)
+        if self._path is None:
+            parent = self._parent_element
+            if parent is None or parent._parent_element is None:
+                self._path = str(self.name)
+            else:
+                self._path = '{0}.{1}'.format(parent.path, self.name)
+        return self._path
 
     @property
     def defined(self):
         return self.value is not None or self.start_line is not None
 
     def parent(self):
-        return next(self.context.ancestors_iter(self))
+        return self._parent_element
 
     def ancestor(self, element_type):
         matches = [e for e in self.context.ancestors_iter(self)
@@ -13,39 +13,62 @@
 #    * See the License for the specific language governing permissions and
 #    * limitations under the License.
 
+import sys
+import time
+
 import networkx as nx
 
 from dsl_parser import exceptions
+from dsl_parser import frozen
+from dsl_parser import profiling
 from dsl_parser.framework import elements
-from dsl_parser.framework.requirements import Requirement
+from dsl_parser.framework.requirements import (Requirement,
+                                               KeyPredicate)
 
 
 class SchemaAPIValidator(object):
 
+    def __init__(self):
+        # element class -> the schema object that (including the schemas
+        # of all element classes it references) already passed validation.
+        # a class whose schema attribute was replaced is validated again.
+        self._validated = {}
+
+    def _is_validated(self, element_cls):
+        return (element_cls in self._validated and
+                self._validated[element_cls] is element_cls.schema)
+
     def validate(self, element_cls):
-        self._traverse_element_cls(element_cls)
+        if self._is_validated(element_cls):
+            return
+        traversed = []
+        self._traverse_element_cls(element_cls, traversed)
+        self._validated.update((cls, cls.schema) for cls in traversed)
 
-    def _traverse_element_cls(self, element_cls):
+    def _traverse_element_cls(self, element_cls, traversed):
         try:
             if not issubclass(element_cls, elements.Element):
                 raise exceptions.DSLParsingSchemaAPIException(1)
         except TypeError:
             raise exceptions.DSLParsingSchemaAPIException(1)
-        self._traverse_schema(element_cls.schema)
+        if self._is_validated(element_cls):
+            return
+        self._traverse_schema(element_cls.schema, traversed)
+        traversed.append(element_cls)
 
-    def _traverse_schema(self, schema, list_nesting=0):
+    def _traverse_schema(self, schema, traversed, list_nesting=0):
         if isinstance(schema, dict):
             for key, value in schema.items():
                 if not isinstance(key, basestring):
                     raise exceptions.DSLParsingSchemaAPIException(1)
-                self._traverse_element_cls(value)
+                self._traverse_element_cls(value, traversed)
         elif isinstance(schema, list):
             if list_nesting > 0:
                 raise exceptions.DSLParsingSchemaAPIException(1)
             if len(schema) == 0:
                 raise exceptions.DSLParsingSchemaAPIException(1)
             for value in schema:
-                self._traverse_schema(value, list_nesting+1)
+                self._traverse_schema(value, traversed, list_nesting+1)
         elif isinstance(schema, elements.ElementType):
             if isinstance(schema, elements.Leaf):
                 if not isinstance(schema.type, (type, list, tuple)):
@@ -55,9 +78,9 @@ class SchemaAPIValidator(object):
                      not all([isinstance(i, type) for i in schema.type]))):
                     raise exceptions.DSLParsingSchemaAPIException(1)
             elif isinstance(schema, elements.Dict):
-                self._traverse_element_cls(schema.type)
+                self._traverse_element_cls(schema.type, traversed)
             elif isinstance(schema, elements.List):
-                self._traverse_element_cls(schema.type)
+                self._traverse_element_cls(schema.type, traversed)
             else:
                 raise exceptions.DSLParsingSchemaAPIException(1)
         else:
@@ -65,46 +88,150 @@ class SchemaAPIValidator(object):
 _schema_validator = SchemaAPIValidator()
 
 
+class ElementSchemaValidator(object):
+    """Validates element values against the schema of an element class.
+
+    The schema is interpreted once, when the validator is created, instead
+    of on every validated element.
+    """
+
+    def __init__(self, element_cls):
+        self.schema = element_cls.schema
+        self.required = element_cls.required
+        if isinstance(self.schema, list):
+            self._alternatives = [_SchemaItemValidator(schema_item)
+                                  for schema_item in self.schema]
+        else:
+            self._alternatives = None
+            self._validator = _SchemaItemValidator(self.schema)
+
+    def validate(self, element, strict):
+        value = element.initial_value
+        if self.required and value is None:
+            raise exceptions.DSLParsingFormatException(
+                1, "'{0}' key is required but it is currently missing"
+                   .format(element.name))
+        if value is None:
+            return
+        if self._alternatives is None:
+            self._validator.validate(element, value, strict)
+            return
+        last_error = None
+        for validator in self._alternatives:
+            try:
+                validator.validate(element, value, strict)
+            except exceptions.DSLParsingFormatException as e:
+                last_error = e
+            else:
+                return
+        if not last_error:
+            raise ValueError('Illegal state should have been '
+                             'identified by schema API validation')
+        raise last_error
+
+
+class _SchemaItemValidator(object):
+
+    def __init__(self, schema):
+        self.is_dict = isinstance(schema, (dict, elements.Dict))
+        self.dict_schema = schema if isinstance(schema, dict) else None
+        self.is_list = isinstance(schema, elements.List)
+        self.leaf_type = schema.type if isinstance(
+            schema, elements.Leaf) else None
+
+    def validate(self, element, value, strict):
+        if self.is_dict:
+            if not isinstance(value, dict):
+                raise exceptions.DSLParsingFormatException(
+                    1, _expected_type_message(value, dict))
+            for key in value.keys():
+                if not isinstance(key, basestring):
+                    raise exceptions.DSLParsingFormatException(
+                        1, "Dict keys must be strings but"
+                           " found '{0}' of type '{1}'"
+                           .format(key, _py_type_to_user_type(type(key))))
+
+        if strict and self.dict_schema is not None:
+            for key in value.keys():
+                if key not in self.dict_schema:
+                    ex = exceptions.DSLParsingFormatException(
+                        1, "'{0}' is not in schema. "
+                           "Valid schema values: {1}"
+                           .format(key, self.dict_schema.keys()))
+                    for child_element in element.children():
+                        if child_element.name == key:
+                            ex.element = child_element
+                            break
+                    raise ex
+
+        if self.is_list and not isinstance(value, list):
+            raise exceptions.DSLParsingFormatException(
+                1, _expected_type_message(value, list))
+
+        if (self.leaf_type is not None and
+                not isinstance(value, self.leaf_type)):
+            raise exceptions.DSLParsingFormatException(
+                1, _expected_type_message(value, self.leaf_type))
+
+
+_element_schema_validators = {}
+
+
+def _element_schema_validator(element_cls):
+    validator = _element_schema_validators.get(element_cls)
+    if (validator is None or
+            validator.schema is not element_cls.schema or
+            validator.required != element_cls.required):
+        validator = ElementSchemaValidator(element_cls)
+        _element_schema_validators[element_cls] = validator
+    return validator
+
+
 class Context(object):
 
     def __init__(self,
                  value,
                  element_cls,
                  element_name,
-                 inputs):
+                 inputs,
+                 observer=None):
         self.inputs = inputs or {}
+        self.observer = observer
         self.element_type_to_elements = {}
+        self._key_indexes = {}
         self._root_element = None
-        self._element_tree = nx.DiGraph()
-        self._element_graph = nx.DiGraph()
-        self._traverse_element_cls(element_cls=element_cls,
-                                   name=element_name,
-                                   value=value,
-                                   parent_element=None)
-        self._calculate_element_graph()
+        self._elements = []
+        with profiling.timed_phase(observer, profiling.PHASE_CONTEXT_BUILD):
+            self._traverse_element_cls(element_cls=element_cls,
+                                       name=element_name,
+                                       value=value,
+                                       parent_element=None)
+        with profiling.timed_phase(observer, profiling.PHASE_GRAPH_BUILD):
+            self._calculate_element_graph()
 
     @property
     def parsed_value(self):
-        return self._root_element.value if self._root_element else None
+        if not self._root_element:
+            return None
+        return frozen.thaw(self._root_element.value)
 
     def child_elements_iter(self, element):
-        return self._element_tree.successors_iter(element)
+        return iter(element._child_elements)
 
     def ancestors_iter(self, element):
-        current_element = element
-        while True:
-            predecessors = self._element_tree.predecessors(current_element)
-            if not predecessors:
-                return
-            if len(predecessors) > 1:
-                raise exceptions.DSLParsingFormatException(
-                    1, 'More than 1 parent found for {0}'
-                       .format(element))
-            current_element = predecessors[0]
+        current_element = element._parent_element
+        while current_element is not None:
             yield current_element
+            current_element = current_element._parent_element
 
     def descendants(self, element):
-        return nx.descendants(self._element_tree, element)
+        result = []
+        stack = list(reversed(element._child_elements))
+        while stack:
+            current_element = stack.pop()
+            result.append(current_element)
+            stack.extend(reversed(current_element._child_elements))
+        return result
 
     def _add_element(self, element, parent=None):
         element_type = type(element)
@@ -112,9 +239,10 @@ class Context(object):
             self.element_type_to_elements[element_type] = []
         self.element_type_to_elements[element_type].append(element)
 
-        self._element_tree.add_node(element)
+        self._elements.append(element)
         if parent:
-            self._element_tree.add_edge(parent, element)
+            element._parent_element = parent
+            parent._child_elements.append(element)
         else:
             self._root_element = element
 
@@ -203,7 +331,11 @@ class Context(object):
                                   parent_element=parent_element)
 
     def _calculate_element_graph(self):
-        self.element_graph = nx.DiGraph(self._element_tree)
+        self.element_graph = nx.DiGraph()
+        self.element_graph.add_nodes_from(self._elements)
+        self.element_graph.add_edges_from(
+            (element._parent_element, element) for element in self._elements
+            if element._parent_element is not None)
         for element_type, _elements in self.element_type_to_elements.items():
             requires = element_type.requires
             for requirement, requirement_values in requires.items():
@@ -214,22 +346,163 @@ class Context(object):
                     continue
                 if requirement == 'self':
                     requirement = element_type
-                dependencies = self.element_type_to_elements.get(
-                    requirement, [])
-                for dependency in dependencies:
-                    for element in _elements:
-                        predicates = [r.predicate for r in requirement_values
-                                      if r.predicate is not None]
-                        add_dependency = not predicates or all([
-                            predicate(element, dependency)
-                            for predicate in predicates])
-                        if add_dependency:
-                            self.element_graph.add_edge(element, dependency)
+                predicates = [r.predicate for r in requirement_values
+                              if r.predicate is not None]
+                for element in _elements:
+                    for dependency in self.requirement_elements(
+                            element, requirement, predicates):
+                        self.element_graph.add_edge(element, dependency)
         # we reverse the graph because only netorkx 1.9.1 has the reverse
         # flag in the topological sort function, it is only used by it
         # so this should be good
         self.element_graph.reverse(copy=False)
 
+    def requirement_elements(self, element, required_type, predicates):
+        """Elements of ``required_type`` satisfying all ``predicates``
+        with ``element`` as the source, in traversal order.
+
+        If one of the predicates is a ``KeyPredicate``, candidates are
+        looked up in a key index instead of evaluating the predicates
+        against every element of ``required_type``.
+        """
+        key_predicates = [p for p in predicates
+                          if isinstance(p, KeyPredicate)]
+        if key_predicates:
+            key_predicate = key_predicates[0]
+            candidates = self._lookup_by_key(element,
+                                             required_type,
+                                             key_predicate)
+            predicates = [p for p in predicates if p is not key_predicate]
+        else:
+            candidates = self.element_type_to_elements.get(required_type, [])
+        if not predicates:
+            return list(candidates)
+        return [candidate for candidate in candidates
+                if all(predicate(element, candidate)
+                       for predicate in predicates)]
+
+    def _lookup_by_key(self, element, required_type, key_predicate):
+        index = self._key_index(required_type, key_predicate.target_key)
+        matches = []
+        for key in key_predicate.source_keys(element):
+            try:
+                matches.extend(index.get(key, ()))
+            except TypeError:
+                # unhashable keys (e.g. values that did not go through
+                # schema validation yet) cannot match any target
+                continue
+        if len(matches) > 1:
+            matches = sorted(set(matches))
+        return [match for _, match in matches]
+
+    def _key_index(self, required_type, target_key):
+        index_key = (required_type, target_key)
+        index = self._key_indexes.get(index_key)
+        if index is None:
+            index = {}
+            for position, target in enumerate(
+                    self.element_type_to_elements.get(required_type, [])):
+                try:
+                    index.setdefault(target_key(target), []).append(
+                        (position, target))
+                except TypeError:
+                    continue
+            self._key_indexes[index_key] = index
+        return index
+
+    def unchanged_elements(self, previous_context):
+        """Maps elements of this context to their processed counterparts
+        in ``previous_context`` (built from an earlier version of the same
+        value with the same root element class and strictness).
+
+        Only elements whose processing result is known to be the same
+        are mapped. Elements are matched by element class and path. An
+        element is considered affected if it has no counterpart, if its
+        initial value, defined-ness or set of dependencies changed, if
+        the child names of one of its ancestors changed (elements
+        validate against the keys of their ancestors), or if any element
+        it depends on in the element graph is affected.
+        """
+        if previous_context is None or self.inputs != previous_context.inputs:
+            return {}
+        keys = self._element_keys()
+        previous_keys = previous_context._element_keys()
+        previous_elements = {}
+        for previous_element, key in previous_keys.iteritems():
+            previous_elements.setdefault(key, []).append(previous_element)
+        matches = {}
+        for element, key in keys.iteritems():
+            candidates = previous_elements.get(key, ())
+            if len(candidates) == 1:
+                matches[element] = candidates[0]
+
+        affected = set()
+        names_changed = set()
+        for element in reversed(self._elements):
+            previous_element = matches.get(element)
+            if previous_element is None:
+                affected.add(element)
+                continue
+            if (element.start_line is None) != \
+                    (previous_element.start_line is None):
+                affected.add(element)
+                continue
+            value = element._initial_value
+            previous_value = previous_element._initial_value
+            if not element._child_elements:
+                if not _strictly_equal(value, previous_value):
+                    affected.add(element)
+                continue
+            if (type(value) is not type(previous_value) or
+                    len(value) != len(previous_value) or
+                    (isinstance(value, dict) and
+                     set(value) != set(previous_value))):
+                names_changed.add(element)
+                affected.add(element)
+            elif any(child in affected for child in element._child_elements):
+                affected.add(element)
+
+        for element in names_changed:
+            affected.update(self.descendants(element))
+
+        graph = self.element_graph
+        previous_graph = previous_context.element_graph
+        for element, previous_element in matches.iteritems():
+            if element in affected:
+                continue
+            dependencies = set(keys[dependency] for dependency
+                               in graph.predecessors_iter(element))
+            previous_dependencies = set(
+                previous_keys[dependency] for dependency
+                in previous_graph.predecessors_iter(previous_element))
+            if dependencies != previous_dependencies:
+                affected.add(element)
+
+        pending = list(affected)
+        while pending:
+            for dependent in graph.successors_iter(pending.pop()):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    pending.append(dependent)
+
+        return dict((element, previous_element)
+                    for element, previous_element in matches.iteritems()
+                    if element not in affected)
+
+    def _element_keys(self):
+        names = {}
+        keys = {}
+        # elements are kept in traversal order, parents before children
+        for element in self._elements:
+            parent = element._parent_element
+            if parent is None or parent not in names:
+                element_names = (element.name,)
+            else:
+                element_names = names[parent] + (element.name,)
+            names[element] = element_names
+            keys[element] = (type(element), element_names)
+        return keys
+
     def elements_graph_topological_sort(self):
         try:
             return nx.topological_sort(self.element_graph)
@@ -253,84 +526,136 @@ class Parser(object):
               element_cls,
               element_name='root',
               inputs=None,
-              strict=True):
+              strict=True,
+              executor=None,
+              observer=None):
+        return self.parse_context(value=value,
+                                  element_cls=element_cls,
+                                  element_name=element_name,
+                                  inputs=inputs,
+                                  strict=strict,
+                                  executor=executor,
+                                  observer=observer).parsed_value
+
+    def parse_context(self,
+                      value,
+                      element_cls,
+                      element_name='root',
+                      inputs=None,
+                      strict=True,
+                      previous_context=None,
+                      executor=None,
+                      observer=None):
+        """Parses ``value`` and returns the processed context.
+
+        If ``previous_context`` is passed, elements whose processing
+        result is known to be unchanged since (see
+        ``Context.unchanged_elements``) take their values from it instead
+        of being processed again.
+
+        If ``executor`` is passed (an object with a ``map(func, iterable)``
+        method such as ``multiprocessing.pool.ThreadPool``), independent
+        elements are processed concurrently on it.
+
+        ``observer`` is an optional ``profiling.ParseObserver`` notified
+        of the time spent in each parse phase and element stage.
+        """
         context = Context(
             value=value,
             element_cls=element_cls,
             element_name=element_name,
-            inputs=inputs)
-        for element in context.elements_graph_topological_sort():
-            try:
+            inputs=inputs,
+            observer=observer)
+        unchanged_elements = context.unchanged_elements(previous_context)
+        with profiling.timed_phase(observer,
+                                   profiling.PHASE_TOPOLOGICAL_SORT):
+            sorted_elements = context.elements_graph_topological_sort()
+        if executor is None:
+            for element in sorted_elements:
+                self._parse_element(element,
+                                    strict=strict,
+                                    unchanged_elements=unchanged_elements)
+        else:
+            self._parse_elements_concurrently(
+                context,
+                sorted_elements,
+                strict=strict,
+                unchanged_elements=unchanged_elements,
+                executor=executor)
+        return context
+
+    def _parse_element(self, element, strict, unchanged_elements):
+        previous_element = unchanged_elements.get(element)
+        if previous_element is not None:
+            element._parsed_value = previous_element._parsed_value
+            element._provided = previous_element._provided
+            return
+        try:
+            if element.context.observer:
+                # the element may be processed by a thread of the executor
+                with profiling.observing(element.context.observer):
+                    self._observed_process_element(element, strict=strict)
+            else:
                 self._validate_element_schema(element, strict=strict)
                 self._process_element(element)
-            except exceptions.DSLParsingException as e:
-                if not e.element:
-                    e.element = element
-                raise
-        return context.parsed_value
+        except exceptions.DSLParsingException as e:
+            if not e.element:
+                e.element = element
+            raise
+
+    def _parse_elements_concurrently(self,
+                                     context,
+                                     sorted_elements,
+                                     strict,
+                                     unchanged_elements,
+                                     executor):
+        """Processes elements level by level, elements of a level depend
+        only on elements of previous levels and are processed concurrently.
+
+        The raised exception is the one serial processing in topological
+        order would raise, i.e. that of the first failing element in that
+        order. Once an element fails, only elements preceding it are
+        processed.
+        """
+        positions = {}
+        element_levels = {}
+        levels = []
+        for position, element in enumerate(sorted_elements):
+            positions[element] = position
+            level = max([element_levels[dependency] + 1 for dependency
+                         in context.element_graph.predecessors_iter(element)]
+                        or [0])
+            element_levels[element] = level
+            if level == len(levels):
+                levels.append([])
+            levels[level].append(element)
+
+        def parse_element(element):
+            try:
+                self._parse_element(element,
+                                    strict=strict,
+                                    unchanged_elements=unchanged_elements)
+            except Exception:
+                return sys.exc_info()
+            return None
+
+        first_error = None
+        for level in levels:
+            if first_error:
+                level = [element for element in level
+                         if positions[element] < first_error[0]]
+            for element, error in zip(level, executor.map(parse_element,
+                                                          level)):
+                if error and (first_error is None or
+                              positions[element] < first_error[0]):
+                    first_error = (positions[element], error)
+        if first_error:
+            exc_type, exc_value, exc_traceback = first_error[1]
+            raise exc_type, exc_value, exc_traceback
 
     @staticmethod
     def _validate_element_schema(element, strict):
-        value = element.initial_value
-        if element.required and value is None:
-            raise exceptions.DSLParsingFormatException(
-                1, "'{0}' key is required but it is currently missing"
-                   .format(element.name))
-
-        def validate_schema(schema):
-            if isinstance(schema, (dict, elements.Dict)):
-                if not isinstance(value, dict):
-                    raise exceptions.DSLParsingFormatException(
-                        1, _expected_type_message(value, dict))
-                for key in value.keys():
-                    if not isinstance(key, basestring):
-                        raise exceptions.DSLParsingFormatException(
-                            1, "Dict keys must be strings but"
-                               " found '{0}' of type '{1}'"
-                               .format(key, _py_type_to_user_type(type(key))))
-
-            if strict and isinstance(schema, dict):
-                for key in value.keys():
-                    if key not in schema:
-                        ex = exceptions.DSLParsingFormatException(
-                            1, "'{0}' is not in schema. "
-                               "Valid schema values: {1}"
-                               .format(key, schema.keys()))
-                        for child_element in element.children():
-                            if child_element.name == key:
-                                ex.element = child_element
-                                break
-                        raise ex
-
-            if (isinstance(schema, elements.List) and
-                    not isinstance(value, list)):
-                raise exceptions.DSLParsingFormatException(
-                    1, _expected_type_message(value, list))
-
-            if (isinstance(schema, elements.Leaf) and
-                    not isinstance(value, schema.type)):
-                raise exceptions.DSLParsingFormatException(
-                    1, _expected_type_message(value, schema.type))
-        if value is not None:
-            if isinstance(element.schema, list):
-                validated = False
-                last_error = None
-                for schema_item in element.schema:
-                    try:
-                        validate_schema(schema_item)
-                    except exceptions.DSLParsingFormatException as e:
-                        last_error = e
-                    else:
-                        validated = True
-                        break
-                if not validated:
-                    if not last_error:
-                        raise ValueError('Illegal state should have been '
-                                         'identified by schema API validation')
-                    else:
-                        raise last_error
-            else:
-                validate_schema(element.schema)
+        _element_schema_validator(type(element)).validate(element, strict)
 
     def _process_element(self, element):
         required_args = self._extract_element_requirements(element)
@@ -338,6 +663,29 @@ class Parser(object):
         element.value = element.parse(**required_args)
         element.provided = element.calculate_provided(**required_args)
 
+    def _observed_process_element(self, element, strict):
+        observer = element.context.observer
+        start = time.time()
+        self._validate_element_schema(element, strict=strict)
+        end = time.time()
+        observer.element_stage_finished(
+            element, profiling.STAGE_SCHEMA_VALIDATION, end - start)
+        required_args = self._extract_element_requirements(element)
+        start = time.time()
+        element.validate(**required_args)
+        end = time.time()
+        observer.element_stage_finished(
+            element, profiling.STAGE_VALIDATE, end - start)
+        start = end
+        element.value = element.parse(**required_args)
+        end = time.time()
+        observer.element_stage_finished(
+            element, profiling.STAGE_PARSE, end - start)
+        start = end
+        element.provided = element.calculate_provided(**required_args)
+        observer.element_stage_finished(
+            element, profiling.STAGE_CALCULATE_PROVIDED, time.time() - start)
+
     @staticmethod
     def _extract_element_requirements(element):
         context = element.context
@@ -359,14 +707,12 @@ class Parser(object):
             else:
                 if required_type == 'self':
                     required_type = type(element)
-                required_type_elements = context.element_type_to_elements.get(
-                    required_type, [])
                 for requirement in requirements:
                     result = []
-                    for required_element in required_type_elements:
-                        if requirement.predicate and not requirement.predicate(
-                                element, required_element):
-                            continue
+                    predicates = [requirement.predicate] \
+                        if requirement.predicate else []
+                    for required_element in context.requirement_elements(
+                            element, required_type, predicates):
                         if requirement.parsed:
                             result.append(required_element.value)
                         else:
@@ -415,13 +761,55 @@ def parse(value,
           element_cls,
           element_name='root',
           inputs=None,
-          strict=True):
+          strict=True,
+          executor=None,
+          observer=None):
     validate_schema_api(element_cls)
     return _parser.parse(value=value,
                          element_cls=element_cls,
                          element_name=element_name,
                          inputs=inputs,
-                         strict=strict)
+                         strict=strict,
+                         executor=executor,
+                         observer=observer)
+
+
+def parse_context(value,
+                  element_cls,
+                  element_name='root',
+                  inputs=None,
+                  strict=True,
+                  previous_context=None,
+                  executor=None,
+                  observer=None):
+    validate_schema_api(element_cls)
+    return _parser.parse_context(value=value,
+                                 element_cls=element_cls,
+                                 element_name=element_name,
+                                 inputs=inputs,
+                                 strict=strict,
+                                 previous_context=previous_context,
+                                 executor=executor,
+                                 observer=observer)
+
+
+def _strictly_equal(value, other):
+    """Equality that also requires equal types (so that 1, 1.0 and True
+    are different values), recursively."""
+    if type(value) is not type(other):
+        return False
+    if isinstance(value, dict):
+        if len(value) != len(other):
+            return False
+        for key, item in value.iteritems():
+            if key not in other or not _strictly_equal(item, other[key]):
+                return False
+        return True
+    elif isinstance(value, list):
+        return len(value) == len(other) and all(
+            _strictly_equal(item, other_item)
+            for item, other_item in zip(value, other))
+    return value == other
 
 
 def _expected_type_message(value, expected_type):
@@ -43,5 +43,40 @@ class Value(Requirement):
                                     predicate=predicate)
 
 
-def sibling_predicate(source, target):
-    return source.parent() == target.parent()
+class KeyPredicate(object):
+    """A requirement predicate that matches a source and a target element
+    by comparing keys extracted from both.
+
+    Unlike an arbitrary predicate, which must be evaluated for every
+    (source, target) pair, a key predicate lets the framework index the
+    targets by key and find matching dependencies with a dict lookup.
+
+    :param source_key: callable returning the key of a source element
+                       (or None if the source matches nothing).
+    :param target_key: callable returning the key of a target element,
+                       defaults to the target element name.
+    :param multiple_keys: whether ``source_key`` returns an iterable of
+                          keys rather than a single key.
+    """
+
+    def __init__(self, source_key, target_key=None, multiple_keys=False):
+        self.source_key = source_key
+        self.target_key = target_key or _element_name
+        self.multiple_keys = multiple_keys
+
+    def source_keys(self, source):
+        keys = self.source_key(source)
+        if keys is None:
+            return []
+        return keys if self.multiple_keys else [keys]
+
+    def __call__(self, source, target):
+        return self.target_key(target) in self.source_keys(source)
+
+
+def _element_name(element):
+    return element.name
+
+
+sibling_predicate = KeyPredicate(source_key=lambda source: source.parent(),
+                                 target_key=lambda target: target.parent())
@@ -0,0 +1,120 @@
+########
+# Copyright (c) 2015 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+#    * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    * See the License for the specific language governing permissions and
+#    * limitations under the License.
+
+import copy
+
+from dsl_parser import exceptions
+
+
+def _read_only(*args, **kwargs):
+    raise exceptions.DSLParsingSchemaAPIException(
+        exceptions.ERROR_CODE_ILLEGAL_VALUE_MODIFICATION,
+        'Cannot modify a read only value, use copy.deepcopy to get '
+        'a modifiable copy of it')
+
+
+class FrozenDict(dict):
+    """A read only dict.
+
+    copy.copy and copy.deepcopy of a frozen dict return plain
+    (modifiable) dicts.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return dict((copy.deepcopy(key, memo), copy.deepcopy(value, memo))
+                    for key, value in self.iteritems())
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+
+class FrozenList(list):
+    """A read only list.
+
+    copy.copy and copy.deepcopy of a frozen list return plain
+    (modifiable) lists.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __setslice__ = _read_only
+    __delslice__ = _read_only
+    __iadd__ = _read_only
+    __imul__ = _read_only
+    append = _read_only
+    extend = _read_only
+    insert = _read_only
+    pop = _read_only
+    remove = _read_only
+    reverse = _read_only
+    sort = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(item, memo) for item in self]
+
+    def __reduce__(self):
+        return FrozenList, (list(self),)
+
+
+def freeze(value):
+    """Returns a read only version of ``value``.
+
+    Plain dicts, lists and sets are converted recursively, already frozen
+    values are returned as is so frozen values can be shared between the
+    structures that contain them. Any other value (including dict and
+    list subclasses) is returned unchanged.
+    """
+    value_type = type(value)
+    if value_type is dict:
+        return FrozenDict((key, freeze(item))
+                          for key, item in value.iteritems())
+    elif value_type is list:
+        return FrozenList(freeze(item) for item in value)
+    elif value_type is set:
+        return frozenset(value)
+    return value
+
+
+def thaw(value):
+    """Returns a modifiable copy of ``value``, copying containers only."""
+    if isinstance(value, dict):
+        if type(value) in (dict, FrozenDict):
+            result = {}
+        else:
+            result = copy.copy(value)
+        for key, item in value.iteritems():
+            result[key] = thaw(item)
+        return result
+    elif type(value) in (list, FrozenList):
+        return [thaw(item) for item in value]
+    return value
@@ -177,17 +177,17 @@ class GetProperty(Function):
                 node = self.context['node_template']
             else:
                 target_node = self.context['relationship']['target_id']
-                node = [
-                    x for x in plan.node_templates
-                    if x['name'] == target_node][0]
+                node = plan.get_node_template(target_node)
+                if node is None:
+                    raise KeyError(
+                        "{0} function node reference '{1}' does not exist."
+                        .format(self.name, target_node))
         else:
-            found = [
-                x for x in plan.node_templates if self.node_name == x['id']]
-            if len(found) == 0:
+            node = plan.get_node_template(self.node_name)
+            if node is None:
                 raise KeyError(
                     "{0} function node reference '{1}' does not exist.".format(
                         self.name, self.node_name))
-            node = found[0]
         self._get_property_value(node)
         return node
 
@@ -243,9 +243,7 @@ class GetAttribute(Function):
                                            self.name,
                                            self.path))
         if self.node_name not in [SELF, SOURCE, TARGET]:
-            found = [
-                x for x in plan.node_templates if self.node_name == x['id']]
-            if not found:
+            if plan.get_node_template(self.node_name) is None:
                 raise KeyError(
                     "{0} function node reference '{1}' does not exist.".format(
                         self.name, self.node_name))
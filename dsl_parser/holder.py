@@ -13,9 +13,59 @@
 #    * See the License for the specific language governing permissions and
 #    * limitations under the License.
 
+import itertools
+
+from dsl_parser import frozen
+
+# marks are packed into a single int: start line, start column, the
+# number of lines spanned and end column. Marks that do not fit are kept
+# as a tuple.
+_COLUMN_BITS = 12
+_COLUMN_MASK = (1 << _COLUMN_BITS) - 1
+_START_LINE_LIMIT = 1 << (62 - 3 * _COLUMN_BITS)
+_NO_MARKS = (None, None, None, None)
+
+# returned by ``Holder._current_restored`` for a stale restored value
+_STALE = object()
+
+
+def _pack_marks(start_line, start_column, end_line, end_column):
+    if start_line is None and start_column is None and \
+            end_line is None and end_column is None:
+        return None
+    try:
+        lines = end_line - start_line
+        if 0 <= start_line < _START_LINE_LIMIT and \
+                0 <= lines <= _COLUMN_MASK and \
+                0 <= start_column <= _COLUMN_MASK and \
+                0 <= end_column <= _COLUMN_MASK:
+            return (((start_line << _COLUMN_BITS | start_column)
+                     << _COLUMN_BITS | lines)
+                    << _COLUMN_BITS | end_column)
+    except TypeError:
+        # some of the marks are missing
+        pass
+    return start_line, start_column, end_line, end_column
+
+
+def _unpack_marks(marks):
+    if marks is None:
+        return _NO_MARKS
+    if isinstance(marks, tuple):
+        return marks
+    end_column = marks & _COLUMN_MASK
+    marks >>= _COLUMN_BITS
+    lines = marks & _COLUMN_MASK
+    marks >>= _COLUMN_BITS
+    start_column = marks & _COLUMN_MASK
+    start_line = marks >> _COLUMN_BITS
+    return start_line, start_column, start_line + lines, end_column
+
 
 class Holder(object):
 
+    __slots__ = ('_value', '_marks', 'filename', '_key_index', '_restored')
+
     def __init__(self,
                  value,
                  start_line=None,
@@ -23,12 +73,39 @@ class Holder(object):
                  end_line=None,
                  end_column=None,
                  filename=None):
-        self.value = value
-        self.start_line = start_line
-        self.start_column = start_column
-        self.end_line = end_line
-        self.end_column = end_column
+        self._value = value
+        self._marks = _pack_marks(start_line, start_column,
+                                  end_line, end_column)
         self.filename = filename
+        # (raw key -> key holder index, indexed dict, indexed size)
+        self._key_index = None
+        # (restored dict/list/set value, its size, restored value)
+        self._restored = None
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+        self._restored = None
+
+    @property
+    def start_line(self):
+        return _unpack_marks(self._marks)[0]
+
+    @property
+    def start_column(self):
+        return _unpack_marks(self._marks)[1]
+
+    @property
+    def end_line(self):
+        return _unpack_marks(self._marks)[2]
+
+    @property
+    def end_column(self):
+        return _unpack_marks(self._marks)[3]
 
     def __str__(self):
         return '{0}<{1}.{2}-{3}.{4} [{5}]>'.format(
@@ -51,21 +128,122 @@ class Holder(object):
             raise ValueError('Value is expected to be of type dict while it'
                              'is in fact of type {0}'
                              .format(type(self.value).__name__))
+        key_index = self._get_key_index()
+        if key_index is not None:
+            try:
+                key_holder = key_index.get(key)
+            except TypeError:
+                # unhashable key
+                pass
+            else:
+                if key_holder is None:
+                    return None, None
+                if key_holder in self.value:
+                    return key_holder, self.value[key_holder]
+                # the key holder was removed from the dict value directly
+                self._key_index = None
+                return self.get_item(key)
         for key_holder, value_holder in self.value.iteritems():
             if key_holder.value == key:
                 return key_holder, value_holder
         return None, None
 
+    def set_item(self, key_holder, value_holder):
+        """Sets ``value_holder`` under ``key_holder`` in the dict value,
+        keeping the key index of ``get_item`` up to date."""
+        value = self.value
+        value[key_holder] = value_holder
+        if self._key_index is not None:
+            key_index, indexed_value, _ = self._key_index
+            if key_index is not None and indexed_value is value:
+                try:
+                    key_index.setdefault(key_holder.value, key_holder)
+                except TypeError:
+                    self._key_index = None
+                else:
+                    self._key_index = key_index, value, len(value)
+
+    def _get_key_index(self):
+        # raw key -> key holder index, built on first lookup and rebuilt
+        # when the dict value is replaced or changes size behind our back,
+        # or when an indexed key holder was removed. Keys replaced directly
+        # on the dict value without changing its size must be set through
+        # set_item to be found. The first key holder in iteration order
+        # wins, same as the scan.
+        value = self.value
+        if self._key_index is not None:
+            key_index, indexed_value, indexed_size = self._key_index
+            if indexed_value is value and indexed_size == len(value):
+                return key_index
+        key_index = {}
+        try:
+            for key_holder in value:
+                key_index.setdefault(key_holder.value, key_holder)
+        except TypeError:
+            # unhashable raw key, lookups fall back to scanning
+            key_index = None
+        self._key_index = key_index, value, len(value)
+        return key_index
+
     def restore(self):
-        if isinstance(self.value, dict):
-            return dict((key_holder.restore(), value_holder.restore())
-                        for key_holder, value_holder in self.value.iteritems())
-        elif isinstance(self.value, list):
-            return [value_holder.restore() for value_holder in self.value]
-        elif isinstance(self.value, set):
-            return set((value_holder.restore() for value_holder in self.value))
+        """Returns the value without holders, read only.
+
+        The restored value is cached and shared with the restored values
+        of the containing holders. It is restored again once the value, or
+        the value of a nested holder, was replaced or changed in size, or
+        a nested holder was replaced.
+        """
+        restored = self._current_restored()
+        if restored is _STALE:
+            value = self._value
+            restored = self._restore()
+            self._restored = value, _size(value), restored
+        return restored
+
+    def _current_restored(self):
+        # checks the cached restored value against the current value and
+        # the current restored values of the nested holders
+        if self._restored is None:
+            return _STALE
+        value, size, restored = self._restored
+        current_value = self._value
+        if current_value is not value or _size(value) != size:
+            return _STALE
+        if isinstance(value, dict):
+            for key_holder, value_holder in value.iteritems():
+                restored_key = key_holder._current_restored()
+                if restored_key is _STALE:
+                    return _STALE
+                restored_item = value_holder._current_restored()
+                if restored_item is _STALE or \
+                        restored.get(restored_key, _STALE) is not \
+                        restored_item:
+                    return _STALE
+        elif isinstance(value, list):
+            for value_holder, restored_item in itertools.izip(value,
+                                                              restored):
+                if value_holder._current_restored() is not restored_item:
+                    return _STALE
+        elif isinstance(value, set):
+            for value_holder in value:
+                restored_item = value_holder._current_restored()
+                if restored_item is _STALE or restored_item not in restored:
+                    return _STALE
+        return restored
+
+    def _restore(self):
+        value = self.value
+        if isinstance(value, dict):
+            return frozen.FrozenDict(
+                (key_holder.restore(), value_holder.restore())
+                for key_holder, value_holder in value.iteritems())
+        elif isinstance(value, list):
+            return frozen.FrozenList(value_holder.restore()
+                                     for value_holder in value)
+        elif isinstance(value, set):
+            return frozenset(value_holder.restore() for value_holder in value)
         else:
-            return self.value
+            return value
 
     @staticmethod
     def of(obj, filename=None):
@@ -84,9 +262,49 @@ class Holder(object):
         return Holder(result, filename=filename)
 
     def copy(self):
-        return Holder(value=self.value,
-                      start_line=self.start_line,
-                      start_column=self.start_column,
-                      end_line=self.end_line,
-                      end_column=self.end_column,
-                      filename=self.filename)
+        result = Holder(value=self.value, filename=self.filename)
+        result._marks = self._marks
+        return result
+
+
+def _size(value):
+    if isinstance(value, (dict, list, set)):
+        return len(value)
+    return None
+
+
+_SCALAR, _DICT, _LIST, _SET = range(4)
+
+
+def to_primitive(value_holder):
+    """Converts a holder tree to nested tuples and lists of plain values,
+    which can be marshalled. ``from_primitive`` converts it back."""
+    value = value_holder.value
+    marks = value_holder._marks
+    if isinstance(value, dict):
+        items = []
+        for key_holder, item_holder in value.iteritems():
+            items.append(to_primitive(key_holder))
+            items.append(to_primitive(item_holder))
+        return _DICT, marks, items
+    elif isinstance(value, list):
+        return _LIST, marks, [to_primitive(item) for item in value]
+    elif isinstance(value, set):
+        return _SET, marks, [to_primitive(item) for item in value]
+    return _SCALAR, marks, value
+
+
+def from_primitive(primitive, filename=None):
+    kind, marks, value = primitive
+    if kind == _DICT:
+        items = iter(value)
+        value = dict((from_primitive(key, filename),
+                      from_primitive(item, filename))
+                     for key, item in itertools.izip(items, items))
+    elif kind == _LIST:
+        value = [from_primitive(item, filename) for item in value]
+    elif kind == _SET:
+        value = set(from_primitive(item, filename) for item in value)
+    result = Holder(value, filename=filename)
+    result._marks = marks
+    return result
@@ -15,16 +15,31 @@
 
 import abc
 import contextlib
+import random
+import threading
 import urllib2
+import urlparse
 import time
 
 import requests
+import requests.adapters
 
 from dsl_parser import exceptions
 
 DEFAULT_RETRY_DELAY = 1
 DEFAULT_NUMBER_RETRIES = 5
 DEFAULT_REQUEST_TIMEOUT = 10
+DEFAULT_MAX_RETRY_DELAY = 10
+# seconds from the start of a parse after which failed requests are no
+# longer retried
+DEFAULT_RETRY_DEADLINE = 60
+# number of hosts whose connections are kept alive
+DEFAULT_POOL_CONNECTIONS = 10
+# connections kept alive per host
+DEFAULT_POOL_MAXSIZE = 10
+
+_session_lock = threading.Lock()
+_default_session = None
 
 
 class AbstractImportResolver(object):
@@ -33,22 +48,199 @@ class AbstractImportResolver(object):
     implementations of import resolver.
     The only mandatory implementation is of resolve, which is expected
     to open the import url and return its data.
+
+    HTTP(S) requests of the resolver should go through ``session``, which
+    keeps connections alive in pools sized by ``pool_connections`` (the
+    number of hosts) and ``pool_maxsize`` (connections per host), and be
+    retried according to ``retry_policy``.
     """
 
     __metaclass__ = abc.ABCMeta
 
+    pool_connections = DEFAULT_POOL_CONNECTIONS
+    pool_maxsize = DEFAULT_POOL_MAXSIZE
+    pool_block = False
+
+    @property
+    def session(self):
+        # created on first use, subclasses are not required to call
+        # this class' __init__
+        session = self.__dict__.get('_session')
+        if session is None:
+            with _session_lock:
+                session = self.__dict__.get('_session')
+                if session is None:
+                    session = self.__dict__['_session'] = create_session(
+                        pool_connections=self.pool_connections,
+                        pool_maxsize=self.pool_maxsize,
+                        pool_block=self.pool_block)
+        return session
+
+    @property
+    def retry_policy(self):
+        retry_policy = self.__dict__.get('_retry_policy')
+        if retry_policy is None:
+            with _session_lock:
+                retry_policy = self.__dict__.get('_retry_policy')
+                if retry_policy is None:
+                    retry_policy = self.__dict__['_retry_policy'] = \
+                        RetryPolicy()
+        return retry_policy
+
+    @retry_policy.setter
+    def retry_policy(self, retry_policy):
+        self.__dict__['_retry_policy'] = retry_policy
+
     @abc.abstractmethod
     def resolve(self, import_url):
         raise NotImplementedError
 
-    def fetch_import(self, import_url):
+    def resolve_with_budget(self, import_url, retry_budget):
+        """Resolves ``import_url``, retrying its reads within the
+        ``retry_budget`` shared by the imports of a parse.
+
+        Resolvers that do not retry their reads ignore the budget.
+        """
+        return self.resolve(import_url)
+
+    def fetch_import(self, import_url, retry_budget=None):
         url_parts = import_url.split(':')
         if url_parts[0] in ['http', 'https', 'ftp']:
-            return self.resolve(import_url)
+            if retry_budget is None:
+                return self.resolve(import_url)
+            return self.resolve_with_budget(import_url, retry_budget)
         return read_import(import_url)
 
 
-def read_import(import_url):
+def create_session(pool_connections=DEFAULT_POOL_CONNECTIONS,
+                   pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                   pool_block=False):
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_default_session():
+    """Returns the session shared by requests made without a resolver."""
+    global _default_session
+    if _default_session is None:
+        with _session_lock:
+            if _default_session is None:
+                _default_session = create_session()
+    return _default_session
+
+
+class RetryPolicy(object):
+    """Retry policy of HTTP(S) import reads.
+
+    Requests failing to connect or timing out are retried up to
+    ``max_retries`` times, after an exponentially growing delay starting
+    at ``base_delay`` and capped at ``max_delay``, of which up to a
+    ``jitter`` fraction is randomly taken off.
+
+    The reads of a parse share a ``RetryBudget`` created by ``budget``:
+    failed requests are not retried once ``deadline`` seconds have passed
+    since it was created, and a host that could not be read from is not
+    contacted again within the budget, so the remaining reads from it
+    fail fast.
+    """
+
+    def __init__(self,
+                 max_retries=None,
+                 base_delay=None,
+                 max_delay=DEFAULT_MAX_RETRY_DELAY,
+                 jitter=0.5,
+                 deadline=DEFAULT_RETRY_DEADLINE,
+                 request_timeout=None):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.deadline = deadline
+        self._request_timeout = request_timeout
+
+    def budget(self):
+        """Returns a new budget for the reads of a parse."""
+        return RetryBudget(self)
+
+    def request_timeout(self, attempt):
+        return self._request_timeout or DEFAULT_REQUEST_TIMEOUT
+
+    def retry_delay(self, attempt):
+        """Returns the delay before retrying a request that failed on
+        its ``attempt`` attempt, or None if it should not be retried."""
+        max_retries = self.max_retries
+        if max_retries is None:
+            max_retries = DEFAULT_NUMBER_RETRIES
+        if attempt >= max_retries:
+            return None
+        base_delay = self.base_delay
+        if base_delay is None:
+            base_delay = DEFAULT_RETRY_DELAY
+        delay = min(self.max_delay, base_delay * 2 ** attempt)
+        delay *= 1 - self.jitter * random.random()
+        return delay
+
+
+class RetryBudget(object):
+    """The deadline and the unreachable hosts of the reads of a single
+    parse, retried according to ``policy``."""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self._deadline_at = None
+        if policy.deadline is not None:
+            self._deadline_at = time.time() + policy.deadline
+        self._lock = threading.Lock()
+        self._failed_hosts = set()
+
+    def request_timeout(self, attempt):
+        timeout = self.policy.request_timeout(attempt)
+        remaining = self._remaining()
+        if attempt and remaining is not None:
+            timeout = max(min(timeout, remaining), 0.001)
+        return timeout
+
+    def retry_delay(self, attempt):
+        delay = self.policy.retry_delay(attempt)
+        remaining = self._remaining()
+        if delay is not None and remaining is not None and \
+                remaining <= delay:
+            return None
+        return delay
+
+    def host_failed(self, url):
+        with self._lock:
+            self._failed_hosts.add(_host(url))
+
+    def is_host_failed(self, url):
+        with self._lock:
+            return _host(url) in self._failed_hosts
+
+    def _remaining(self):
+        deadline_at = self._deadline_at
+        if deadline_at is None:
+            return None
+        return deadline_at - time.time()
+
+
+def _host(url):
+    return urlparse.urlsplit(url).netloc
+
+
+def read_import(import_url, session=None, cache=None, retry_policy=None):
+    """Reads the import at ``import_url``.
+
+    HTTP(S) imports are read through ``session`` (or a shared session),
+    retried according to ``retry_policy`` and, if an ``HttpCache`` is
+    given, are served from or revalidated against it. ``retry_policy`` is
+    either a ``RetryPolicy`` or the ``RetryBudget`` of a parse.
+    """
     error_str = 'Import failed: Unable to open import url'
     if import_url.startswith('file:'):
         try:
@@ -59,26 +251,54 @@ def read_import(import_url):
                 13, '{0} {1}; {2}'.format(error_str, import_url, ex))
             raise ex
     else:
-        num_retries = 0
+        session = session or get_default_session()
+        retry_policy = retry_policy or RetryPolicy()
+        if isinstance(retry_policy, RetryPolicy):
+            # the read has a budget of its own
+            retry_policy = retry_policy.budget()
+        entry = cache.get(import_url) if cache is not None else None
+        headers = None
+        if entry is not None:
+            if entry.is_fresh():
+                return entry.body
+            headers = entry.conditional_headers()
+        if retry_policy.is_host_failed(import_url):
+            if entry is not None and cache.serve_stale:
+                return entry.body
+            raise exceptions.DSLParsingLogicException(
+                13, '{0} {1}; host {2} could not be reached earlier'.format(
+                    error_str, import_url, _host(import_url)))
+        attempt = 0
         while True:
             try:
-                response = requests.get(import_url,
-                                        timeout=DEFAULT_REQUEST_TIMEOUT)
-            except requests.ConnectionError as err:
-                if num_retries >= DEFAULT_NUMBER_RETRIES:
+                response = session.get(
+                    import_url,
+                    timeout=retry_policy.request_timeout(attempt),
+                    headers=headers)
+            except (requests.ConnectionError, requests.Timeout) as err:
+                delay = retry_policy.retry_delay(attempt)
+                if delay is None:
+                    retry_policy.host_failed(import_url)
+                    if entry is not None and cache.serve_stale:
+                        return entry.body
                     ex = exceptions.DSLParsingLogicException(
                         13, '{0} {1}; {2}'.format(
                             error_str, import_url, err))
                     raise ex
-                time.sleep(DEFAULT_RETRY_DELAY)
-                num_retries += 1
+                time.sleep(delay)
+                attempt += 1
             except requests.URLRequired as err:
                 ex = exceptions.DSLParsingLogicException(
                     13, '{0} {1}; {2}'.format(
                         error_str, import_url, err))
                 raise ex
             else:
+                if response.status_code == 304 and entry is not None:
+                    cache.put(import_url, response, entry)
+                    return entry.body
                 if 200 <= response.status_code < 300:
+                    if cache is not None:
+                        cache.put(import_url, response)
                     return response.text
                 else:
                     ex = exceptions.DSLParsingLogicException(
@@ -0,0 +1,224 @@
+#########
+# Copyright (c) 2015 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+#  * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  * See the License for the specific language governing permissions and
+#  * limitations under the License.
+
+import io
+import mmap
+import struct
+import tarfile
+import time
+import zipfile
+import zlib
+
+from dsl_parser import (exceptions,
+                        utils)
+from dsl_parser.import_resolver.abstract_import_resolver import \
+    AbstractImportResolver
+
+# offsets in the local file header of a zip member
+_ZIP_HEADER_FORMAT = '<4s2B4HL2L2H'
+_ZIP_HEADER_SIZE = struct.calcsize(_ZIP_HEADER_FORMAT)
+_ZIP_HEADER_FILENAME_LENGTH = 10
+_ZIP_HEADER_EXTRA_FIELD_LENGTH = 11
+
+
+class BundleResolverValidationException(Exception):
+    pass
+
+
+class BundleImportResolver(AbstractImportResolver):
+    """
+    This class is an import resolver serving imports from a single bundle
+    file, which is either a zip file or an uncompressed tar file, such as
+    the ones written by ``build_bundle``.
+
+    The members of the bundle are indexed once, and are read from a memory
+    map of the bundle at their offsets.
+
+    Each rule in the ``rules`` list is a dictionary with one (key, value)
+    pair, mapping an URL prefix to a member name prefix, as the rules of
+    ``DefaultImportResolver`` do. The rules are tried in order, and if none
+    of them matches a member, the member named by ``url_to_member`` is
+    used.
+
+    For example, with the rules: [
+            {'http://www.getcloudify.org/spec': 'spec'}
+        ]
+        the url 'http://www.getcloudify.org/spec/cloudify/3.3/types.yaml'
+        is read from the 'spec/cloudify/3.3/types.yaml' member, and if
+        there is no such member, from the
+        'www.getcloudify.org/spec/cloudify/3.3/types.yaml' member.
+    """
+
+    def __init__(self, bundle_path, rules=None):
+        self.bundle_path = bundle_path
+        self.rules = rules if rules is not None else []
+        self._validate_rules()
+        with open(bundle_path, 'rb') as f:
+            if zipfile.is_zipfile(f):
+                self._index = self._index_zip(bundle_path)
+            else:
+                self._index = self._index_tar(bundle_path)
+            # members are sliced out of the map, which can be shared by
+            # concurrent imports fetches
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def resolve(self, import_url):
+        member = self._find_member(import_url)
+        if member is None:
+            ex = exceptions.DSLParsingLogicException(
+                13, 'Import failed: Unable to open import url {0}; '
+                    'it is not in the bundle {1}'
+                    .format(import_url, self.bundle_path))
+            ex.failed_import = import_url
+            raise ex
+        offset, size, compress_type = self._index[member]
+        data = self._map[offset:offset + size]
+        if compress_type == zipfile.ZIP_DEFLATED:
+            data = zlib.decompress(data, -zlib.MAX_WBITS)
+        return data.decode('utf-8')
+
+    def close(self):
+        self._map.close()
+
+    def _find_member(self, import_url):
+        for rule in self.rules:
+            prefix, member_prefix = rule.items()[0]
+            if import_url.startswith(prefix):
+                member = member_prefix + import_url[len(prefix):]
+                if member in self._index:
+                    return member
+        member = url_to_member(import_url)
+        if member in self._index:
+            return member
+        return None
+
+    def _index_zip(self, bundle_path):
+        index = {}
+        with zipfile.ZipFile(bundle_path) as bundle, \
+                open(bundle_path, 'rb') as f:
+            for info in bundle.infolist():
+                if info.flag_bits & 0x1:
+                    raise BundleResolverValidationException(
+                        'Member {0} of bundle {1} is encrypted'
+                        .format(info.filename, bundle_path))
+                if info.compress_type not in [zipfile.ZIP_STORED,
+                                              zipfile.ZIP_DEFLATED]:
+                    raise BundleResolverValidationException(
+                        'Member {0} of bundle {1} uses an unsupported '
+                        'compression method {2}'
+                        .format(info.filename, bundle_path,
+                                info.compress_type))
+                f.seek(info.header_offset)
+                header = struct.unpack(_ZIP_HEADER_FORMAT,
+                                       f.read(_ZIP_HEADER_SIZE))
+                offset = info.header_offset + _ZIP_HEADER_SIZE + \
+                    header[_ZIP_HEADER_FILENAME_LENGTH] + \
+                    header[_ZIP_HEADER_EXTRA_FIELD_LENGTH]
+                index[info.filename] = (offset, info.compress_size,
+                                        info.compress_type)
+        return index
+
+    def _index_tar(self, bundle_path):
+        try:
+            bundle = tarfile.open(bundle_path, 'r:')
+        except tarfile.TarError as e:
+            raise BundleResolverValidationException(
+                'Bundle {0} is neither a zip file nor an uncompressed tar '
+                'file: {1}'.format(bundle_path, e))
+        with bundle:
+            return dict((info.name, (info.offset_data, info.size, None))
+                        for info in bundle if info.isfile())
+
+    def _validate_rules(self):
+        if not isinstance(self.rules, list):
+            raise BundleResolverValidationException(
+                'Invalid parameters supplied for the bundle resolver: '
+                'The `rules` parameter must be a list but it is of type {0}.'
+                .format(type(self.rules).__name__))
+        for rule in self.rules:
+            if not isinstance(rule, dict) or len(rule) != 1:
+                raise BundleResolverValidationException(
+                    'Invalid parameters supplied for the bundle resolver: '
+                    'Each rule must be a dictionary with one (key,value) '
+                    'pair but the rule is [{0}].'.format(rule))
+
+
+def url_to_member(import_url):
+    """Returns the name of the bundle member holding ``import_url``, which
+    is the url without its scheme."""
+    return import_url.partition('://')[2] or import_url
+
+
+def build_bundle(dsl_location, bundle_path, resolver=None,
+                 resources_base_url=None):
+    """Writes the imports of the blueprint at ``dsl_location``, and the
+    imports of those, that are read through ``resolver`` to a bundle at
+    ``bundle_path``. The bundle is a zip file unless ``bundle_path`` ends
+    with ``.tar``, in which case it is an uncompressed tar file.
+
+    Returns the bundled import urls.
+    """
+    resolver = resolver or utils.create_import_resolver(None)
+    location = utils.dsl_location_to_url(dsl_location, resources_base_url)
+    # import url -> content
+    bundled = {}
+    visited = set([location])
+    to_visit = [(location, resolver.fetch_import(location))]
+    while to_visit:
+        current_import, raw_dsl = to_visit.pop()
+        parsed_dsl = utils.load_yaml(
+            raw_yaml=raw_dsl,
+            error_message="Failed to parse import '{0}'"
+                          .format(current_import),
+            filename=current_import).restore()
+        for another_import in parsed_dsl.get('imports') or []:
+            import_url = utils.get_resource_location(another_import,
+                                                     resources_base_url,
+                                                     current_import)
+            if import_url is None:
+                raise exceptions.DSLParsingLogicException(
+                    13, "Import failed: no suitable location found for "
+                        "import '{0}'".format(another_import))
+            if import_url in visited:
+                continue
+            visited.add(import_url)
+            raw_imported_dsl = resolver.fetch_import(import_url)
+            if import_url.split(':')[0] in ['http', 'https', 'ftp']:
+                if isinstance(raw_imported_dsl, unicode):
+                    raw_imported_dsl = raw_imported_dsl.encode('utf-8')
+                bundled[import_url] = raw_imported_dsl
+            to_visit.append((import_url, raw_imported_dsl))
+    members = dict((url_to_member(import_url), data)
+                   for import_url, data in bundled.iteritems())
+    if bundle_path.endswith('.tar'):
+        _write_tar(bundle_path, members)
+    else:
+        _write_zip(bundle_path, members)
+    return sorted(bundled)
+
+
+def _write_zip(bundle_path, members):
+    with zipfile.ZipFile(bundle_path, 'w', zipfile.ZIP_DEFLATED) as bundle:
+        for member, data in sorted(members.iteritems()):
+            bundle.writestr(member, data)
+
+
+def _write_tar(bundle_path, members):
+    with tarfile.open(bundle_path, 'w') as bundle:
+        for member, data in sorted(members.iteritems()):
+            info = tarfile.TarInfo(member)
+            info.size = len(data)
+            info.mtime = time.time()
+            bundle.addfile(info, io.BytesIO(data))
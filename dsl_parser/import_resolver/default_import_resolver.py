@@ -15,7 +15,8 @@
 from dsl_parser.exceptions import DSLParsingLogicException
 
 from dsl_parser.import_resolver.abstract_import_resolver \
-    import AbstractImportResolver, read_import
+    import AbstractImportResolver, RetryPolicy, read_import
+from dsl_parser.import_resolver.http_cache import HttpCache
 
 DEFAULT_RULES = []
 DEFAULT_RESLOVER_RULES_KEY = 'rules'
@@ -70,16 +71,44 @@ class DefaultImportResolver(AbstractImportResolver):
 
         In case that all the resolve attempts will fail,
         a DSLParsingLogicException will be raise.
+
+    The optional ``pool_connections`` and ``pool_maxsize`` parameters
+    override the size of the connection pools of the resolver session.
+
+    If ``cache_dir`` is given, imports read over HTTP(S) are cached in that
+    directory (see ``HttpCache``), and with ``serve_stale`` cached imports
+    are used when their server cannot be reached.
+
+    ``retry_policy`` is a ``RetryPolicy`` or a dictionary of its
+    parameters, with which failed reads are retried. A host that could not
+    be reached is not retried for the following reads sharing the same
+    budget: the following rules of an import, and the following imports of
+    a parse when they are fetched with ``resolve_with_budget``.
     """
 
-    def __init__(self, rules=None):
+    def __init__(self, rules=None, pool_connections=None, pool_maxsize=None,
+                 cache_dir=None, serve_stale=False, retry_policy=None):
         # set the rules
         self.rules = rules
         if self.rules is None:
             self.rules = DEFAULT_RULES
         self._validate_rules()
+        for name, value in [('pool_connections', pool_connections),
+                            ('pool_maxsize', pool_maxsize)]:
+            if value is not None:
+                self._validate_pool_size(name, value)
+                setattr(self, name, value)
+        if retry_policy is not None:
+            self.retry_policy = self._create_retry_policy(retry_policy)
+        self.cache = None
+        if cache_dir:
+            self.cache = HttpCache(cache_dir, serve_stale=serve_stale)
 
     def resolve(self, import_url):
+        return self.resolve_with_budget(import_url,
+                                        self.retry_policy.budget())
+
+    def resolve_with_budget(self, import_url, retry_budget):
         failed_urls = {}
         # trying to find a matching rule that can resolve this url
         for rule in self.rules:
@@ -94,7 +123,10 @@ class DefaultImportResolver(AbstractImportResolver):
                 if url_to_resolve not in failed_urls.keys():
                     # there is no point to try to resolve the same url twice
                     try:
-                        return read_import(url_to_resolve)
+                        return read_import(url_to_resolve,
+                                           self.session,
+                                           self.cache,
+                                           retry_budget)
                     except DSLParsingLogicException, ex:
                         # failed to resolve current rule,
                         # continue to the next one
@@ -103,7 +135,8 @@ class DefaultImportResolver(AbstractImportResolver):
         # failed to resolve the url using the rules
         # trying to open the original url
         try:
-            return read_import(import_url)
+            return read_import(import_url, self.session, self.cache,
+                               retry_budget)
         except DSLParsingLogicException, ex:
             if not self.rules:
                 raise
@@ -143,3 +176,28 @@ class DefaultImportResolver(AbstractImportResolver):
                     'Each rule must be a dictionary with one (key,value) pair '
                     'but the rule [{0}] has {1} keys.'
                     .format(rule, len(keys)))
+
+    @staticmethod
+    def _validate_pool_size(name, value):
+        if not isinstance(value, int) or isinstance(value, bool) \
+                or value < 1:
+            raise DefaultResolverValidationException(
+                'Invalid parameters supplied for the default resolver: '
+                'The `{0}` parameter must be a positive integer but it is '
+                '{1}.'.format(name, value))
+
+    @staticmethod
+    def _create_retry_policy(retry_policy):
+        if isinstance(retry_policy, RetryPolicy):
+            return retry_policy
+        if isinstance(retry_policy, dict):
+            try:
+                return RetryPolicy(**retry_policy)
+            except TypeError as e:
+                error = e
+        else:
+            error = 'it is of type {0}'.format(type(retry_policy).__name__)
+        raise DefaultResolverValidationException(
+            'Invalid parameters supplied for the default resolver: '
+            'The `retry_policy` parameter must be a dictionary of retry '
+            'policy parameters: {0}.'.format(error))
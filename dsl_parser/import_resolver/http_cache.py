@@ -0,0 +1,139 @@
+#########
+# Copyright (c) 2015 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+#  * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  * See the License for the specific language governing permissions and
+#  * limitations under the License.
+
+import errno
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+_TEMP_PREFIX = '.tmp-'
+
+
+class CacheEntry(object):
+
+    def __init__(self, body, etag=None, last_modified=None, expires=None):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        # time until which the entry may be used without revalidation
+        self.expires = expires
+
+    def is_fresh(self):
+        return self.expires is not None and time.time() < self.expires
+
+    def conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class HttpCache(object):
+    """Cache of imports fetched over HTTP(S), stored in ``cache_dir``.
+
+    Each entry holds the body of the response along with its ETag and
+    Last-Modified headers, which are used to revalidate the entry with a
+    conditional request. Entries are used without revalidation for the
+    ``max-age`` given in the Cache-Control header of the response.
+
+    If ``serve_stale`` is set, entries are used when the server cannot be
+    reached, regardless of their age.
+    """
+
+    def __init__(self, cache_dir, serve_stale=False):
+        self.cache_dir = cache_dir
+        self.serve_stale = serve_stale
+        try:
+            os.makedirs(cache_dir)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+    def get(self, url):
+        """Returns the cached entry of ``url`` or None."""
+        try:
+            with open(self._path(url)) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get('url') != url:
+            return None
+        return CacheEntry(body=data.get('body'),
+                          etag=data.get('etag'),
+                          last_modified=data.get('last_modified'),
+                          expires=data.get('expires'))
+
+    def put(self, url, response, entry=None):
+        """Stores the ``response`` of fetching ``url``.
+
+        For a ``304 Not Modified`` response, ``entry`` is the revalidated
+        entry, which is stored with the freshness of the response.
+        """
+        cache_control = _parse_cache_control(
+            response.headers.get('Cache-Control'))
+        if 'no-store' in cache_control:
+            return
+        if response.status_code == 304:
+            body = entry.body
+            etag = response.headers.get('ETag') or entry.etag
+            last_modified = (response.headers.get('Last-Modified') or
+                             entry.last_modified)
+        else:
+            body = response.text
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+        expires = None
+        if 'no-cache' not in cache_control:
+            try:
+                max_age = int(cache_control['max-age'])
+                age = int(response.headers.get('Age') or 0)
+            except (KeyError, TypeError, ValueError):
+                pass
+            else:
+                expires = time.time() + max_age - age
+        data = json.dumps({'url': url,
+                           'body': body,
+                           'etag': etag,
+                           'last_modified': last_modified,
+                           'expires': expires})
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir,
+                                         prefix=_TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(data)
+            os.rename(temp_path, self._path(url))
+        except (IOError, OSError):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def _path(self, url):
+        return os.path.join(self.cache_dir,
+                            hashlib.sha256(url.encode('utf-8')).hexdigest())
+
+
+def _parse_cache_control(value):
+    directives = {}
+    for directive in (value or '').split(','):
+        name, _, argument = directive.partition('=')
+        name = name.strip().lower()
+        if name:
+            directives[name] = argument.strip().strip('"')
+    return directives
@@ -52,3 +52,36 @@ class Plan(dict):
     @property
     def node_templates(self):
         return self['nodes']
+
+    def get_node_template(self, node_id):
+        """Returns the node template with the id ``node_id`` or None.
+
+        Node templates are looked up in an index of their ids, which is
+        built on first use and rebuilt when the node templates list is
+        replaced or changes length, or when an indexed position no longer
+        holds the requested id.
+        """
+        node_templates = self.node_templates
+        position = self._node_templates_index(node_templates).get(node_id)
+        if position is None:
+            return None
+        if node_templates[position]['id'] != node_id:
+            # the node templates were replaced in place since the index
+            # was built
+            position = self._node_templates_index(node_templates,
+                                                  rebuild=True).get(node_id)
+            if position is None:
+                return None
+        return node_templates[position]
+
+    def _node_templates_index(self, node_templates, rebuild=False):
+        indexed = self.__dict__.get('_node_templates_index_entry')
+        if rebuild or indexed is None or \
+                indexed[0] is not node_templates or \
+                indexed[1] != len(node_templates):
+            index = {}
+            for position, node_template in enumerate(node_templates):
+                index.setdefault(node_template['id'], position)
+            indexed = (node_templates, len(node_templates), index)
+            self.__dict__['_node_templates_index_entry'] = indexed
+        return indexed[2]
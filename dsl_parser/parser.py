@@ -17,9 +17,11 @@ import contextlib
 import urllib2
 
 from dsl_parser import (functions,
+                        profiling,
                         utils)
 from dsl_parser.framework import parser
-from dsl_parser.elements import blueprint
+from dsl_parser.elements import (blueprint,
+                                 operation)
 from dsl_parser.import_resolver.default_import_resolver import \
     DefaultImportResolver
 
@@ -27,20 +29,29 @@ from dsl_parser.import_resolver.default_import_resolver import \
 def parse_from_path(dsl_file_path,
                     resources_base_url=None,
                     resolver=None,
-                    validate_version=True):
+                    validate_version=True,
+                    executor=None,
+                    observer=None,
+                    yaml_cache=None):
     with open(dsl_file_path, 'r') as f:
         dsl_string = f.read()
     return _parse(dsl_string,
                   resources_base_url=resources_base_url,
                   dsl_location=dsl_file_path,
                   resolver=resolver,
-                  validate_version=validate_version)
+                  validate_version=validate_version,
+                  executor=executor,
+                  observer=observer,
+                  yaml_cache=yaml_cache)
 
 
 def parse_from_url(dsl_url,
                    resources_base_url=None,
                    resolver=None,
-                   validate_version=True):
+                   validate_version=True,
+                   executor=None,
+                   observer=None,
+                   yaml_cache=None):
     try:
         with contextlib.closing(urllib2.urlopen(dsl_url)) as f:
             dsl_string = f.read()
@@ -56,27 +67,131 @@ def parse_from_url(dsl_url,
                   resources_base_url=resources_base_url,
                   dsl_location=dsl_url,
                   resolver=resolver,
-                  validate_version=validate_version)
+                  validate_version=validate_version,
+                  executor=executor,
+                  observer=observer,
+                  yaml_cache=yaml_cache)
 
 
 def parse(dsl_string,
           resources_base_url=None,
           resolver=None,
-          validate_version=True):
+          validate_version=True,
+          executor=None,
+          observer=None,
+          yaml_cache=None):
     return _parse(dsl_string,
                   resources_base_url=resources_base_url,
                   resolver=resolver,
-                  validate_version=validate_version)
+                  validate_version=validate_version,
+                  executor=executor,
+                  observer=observer,
+                  yaml_cache=yaml_cache)
+
+
+class ParseSession(object):
+    """Parses successive versions of the same blueprint.
+
+    Each parse reuses the results of the previous successful parse of
+    the session for the blueprint elements that are not affected by the
+    changes made since, instead of processing them again. The returned
+    plan is identical to the one ``parse`` returns for the same input.
+    """
+
+    def __init__(self,
+                 resources_base_url=None,
+                 resolver=None,
+                 validate_version=True,
+                 executor=None,
+                 observer=None,
+                 yaml_cache=None):
+        self.resources_base_url = resources_base_url
+        self.resolver = resolver
+        self.validate_version = validate_version
+        self.executor = executor
+        self.observer = observer
+        self.yaml_cache = yaml_cache
+        self._context = None
+
+    def parse(self, dsl_string, dsl_location=None):
+        context = _parse_context(dsl_string,
+                                 resources_base_url=self.resources_base_url,
+                                 dsl_location=dsl_location,
+                                 resolver=self.resolver,
+                                 validate_version=self.validate_version,
+                                 previous_context=self._context,
+                                 executor=self.executor,
+                                 observer=self.observer,
+                                 yaml_cache=self.yaml_cache)
+        self._context = context
+        plan = context.parsed_value
+        functions.validate_functions(plan)
+        return plan
 
 
 def _parse(dsl_string,
            resources_base_url,
            dsl_location=None,
            resolver=None,
-           validate_version=True):
-    parsed_dsl_holder = utils.load_yaml(raw_yaml=dsl_string,
-                                        error_message='Failed to parse DSL',
-                                        filename=dsl_location)
+           validate_version=True,
+           executor=None,
+           observer=None,
+           yaml_cache=None):
+    plan = _parse_context(dsl_string,
+                          resources_base_url=resources_base_url,
+                          dsl_location=dsl_location,
+                          resolver=resolver,
+                          validate_version=validate_version,
+                          executor=executor,
+                          observer=observer,
+                          yaml_cache=yaml_cache).parsed_value
+    functions.validate_functions(plan)
+    return plan
+
+
+def _parse_context(dsl_string,
+                   resources_base_url,
+                   dsl_location=None,
+                   resolver=None,
+                   validate_version=True,
+                   previous_context=None,
+                   executor=None,
+                   observer=None,
+                   yaml_cache=None):
+    if observer:
+        observer.parse_started()
+    try:
+        with profiling.observing(observer), utils.url_existence_cache():
+            return _parse_observed_context(
+                dsl_string,
+                resources_base_url=resources_base_url,
+                dsl_location=dsl_location,
+                resolver=resolver,
+                validate_version=validate_version,
+                previous_context=previous_context,
+                executor=executor,
+                observer=observer,
+                yaml_cache=yaml_cache)
+    finally:
+        if observer:
+            observer.parse_finished()
+
+
+def _parse_observed_context(dsl_string,
+                            resources_base_url,
+                            dsl_location,
+                            resolver,
+                            validate_version,
+                            previous_context,
+                            executor,
+                            observer,
+                            yaml_cache):
+    with profiling.timed_phase(observer, profiling.PHASE_LOAD_YAML):
+        parsed_dsl_holder = utils.load_yaml(
+            raw_yaml=dsl_string,
+            error_message='Failed to parse DSL',
+            filename=dsl_location,
+            cache=yaml_cache)
 
     if not resolver:
         resolver = DefaultImportResolver()
@@ -88,7 +203,9 @@ def _parse(dsl_string,
         inputs={
             'validate_version': validate_version
         },
-        strict=False)
+        strict=False,
+        executor=executor,
+        observer=observer)
     version = result['plan_version']
 
     # handle imports
@@ -100,21 +217,33 @@ def _parse(dsl_string,
             'blueprint_location': dsl_location,
             'version': version,
             'resolver': resolver,
-            'validate_version': validate_version
+            'validate_version': validate_version,
+            'yaml_cache': yaml_cache,
+            'observer': observer
         },
         element_cls=blueprint.BlueprintImporter,
-        strict=False)
+        strict=False,
+        executor=executor,
+        observer=observer)
     resource_base = result['resource_base']
     merged_blueprint_holder = result['merged_blueprint']
+    # elements may be processed on the threads of the executor, so the
+    # existence cache of the parse is passed to them as an input
+    existence_cache = utils.current_url_existence_cache()
+    operation.prefetch_resource_exists(merged_blueprint_holder,
+                                       resource_base,
+                                       getattr(resolver, 'session', None),
+                                       existence_cache)
 
     # parse blueprint
-    plan = parser.parse(
+    return parser.parse_context(
         value=merged_blueprint_holder,
         inputs={
             'resource_base': resource_base,
+            'existence_cache': existence_cache,
             'validate_version': validate_version
         },
-        element_cls=blueprint.Blueprint)
-
-    functions.validate_functions(plan)
-    return plan
+        element_cls=blueprint.Blueprint,
+        previous_context=previous_context,
+        executor=executor,
+        observer=observer)
@@ -0,0 +1,204 @@
+########
+# Copyright (c) 2015 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+#    * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    * See the License for the specific language governing permissions and
+#    * limitations under the License.
+
+import contextlib
+import copy
+import gc
+import threading
+import time
+from StringIO import StringIO
+
+PHASE_LOAD_YAML = 'load_yaml'
+PHASE_CONTEXT_BUILD = 'context_build'
+PHASE_GRAPH_BUILD = 'graph_build'
+PHASE_TOPOLOGICAL_SORT = 'topological_sort'
+
+STAGE_SCHEMA_VALIDATION = 'schema_validation'
+STAGE_VALIDATE = 'validate'
+STAGE_PARSE = 'parse'
+STAGE_CALCULATE_PROVIDED = 'calculate_provided'
+
+# copy.deepcopy is replaced by a single counting wrapper while any
+# collector is profiling a parse
+_deepcopy_lock = threading.Lock()
+_deepcopy_users = 0
+_original_deepcopy = copy.deepcopy
+# the collectors of the parse each thread is working on (see ``observing``)
+_observing_local = threading.local()
+
+
+class ParseObserver(object):
+    """Receives parse instrumentation events, all methods are no-ops.
+
+    Subclass and override the events of interest and pass an instance
+    as the ``observer`` argument of the parse functions.
+    """
+
+    def parse_started(self):
+        pass
+
+    def parse_finished(self):
+        pass
+
+    def phase_finished(self, phase, duration):
+        pass
+
+    def import_fetched(self, import_url, duration):
+        pass
+
+    def element_stage_finished(self, element, stage, duration):
+        pass
+
+
+@contextlib.contextmanager
+def observing(observer):
+    """Marks the calling thread as working on the parse observed by
+    ``observer`` for the duration of the block, so that the deepcopies it
+    makes are counted if ``observer`` is a ``ProfilingCollector``.
+
+    Entered by the parsing thread for the whole parse, and by the threads
+    of an executor for each element they process.
+    """
+    observers = getattr(_observing_local, 'observers', None)
+    if observers is None:
+        observers = _observing_local.observers = []
+    if not isinstance(observer, ProfilingCollector) or \
+            observer in observers:
+        yield
+        return
+    observers.append(observer)
+    try:
+        yield
+    finally:
+        observers.remove(observer)
+
+
+@contextlib.contextmanager
+def timed_phase(observer, phase):
+    if observer is None:
+        yield
+        return
+    start = time.time()
+    try:
+        yield
+    finally:
+        observer.phase_finished(phase, time.time() - start)
+
+
+class _Timing(object):
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+
+
+class ProfilingCollector(ParseObserver):
+    """Aggregates parse timings by phase, import and element class.
+
+    While a parse is running, top level ``copy.deepcopy`` calls made by
+    the threads working on it are counted, and the growth in the number of
+    objects tracked by the garbage collector is recorded when it finishes.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.imports = {}
+        self.element_stages = {}
+        self.deepcopy_count = 0
+        self.allocated_objects = 0
+        self._lock = threading.Lock()
+        self._gc_objects = 0
+
+    def parse_started(self):
+        self._gc_objects = len(gc.get_objects())
+        _start_counting_deepcopy()
+
+    def parse_finished(self):
+        _stop_counting_deepcopy()
+        self.allocated_objects += len(gc.get_objects()) - self._gc_objects
+
+    def deepcopy_called(self):
+        with self._lock:
+            self.deepcopy_count += 1
+
+    def phase_finished(self, phase, duration):
+        self._add(self.phases, phase, duration)
+
+    def import_fetched(self, import_url, duration):
+        self._add(self.imports, import_url, duration)
+
+    def element_stage_finished(self, element, stage, duration):
+        self._add(self.element_stages,
+                  (type(element).__name__, stage),
+                  duration)
+
+    def _add(self, timings, key, duration):
+        with self._lock:
+            timing = timings.get(key)
+            if timing is None:
+                timing = timings[key] = _Timing()
+            timing.add(duration)
+
+    def report(self):
+        """Returns the collected timings as text, slowest first."""
+        report = StringIO()
+
+        def write_timings(title, timings):
+            report.write('{0}:\n'.format(title))
+            for key, timing in sorted(timings.iteritems(),
+                                      key=lambda item: -item[1].total):
+                if isinstance(key, tuple):
+                    key = '.'.join(key)
+                report.write('  {0:<60} {1:>8} {2:>12.6f} {3:>12.6f}\n'
+                             .format(key, timing.count, timing.total,
+                                     timing.total / timing.count))
+
+        report.write('{0:<62} {1:>8} {2:>12} {3:>12}\n'
+                     .format('', 'count', 'total [s]', 'mean [s]'))
+        write_timings('phases', self.phases)
+        write_timings('imports', self.imports)
+        write_timings('element stages', self.element_stages)
+        report.write('deepcopy calls: {0}\n'.format(self.deepcopy_count))
+        report.write('allocated objects: {0}\n'
+                     .format(self.allocated_objects))
+        return report.getvalue()
+
+
+def _counting_deepcopy(x, memo=None, _nil=[]):
+    if memo is None:
+        for collector in getattr(_observing_local, 'observers', ()):
+            collector.deepcopy_called()
+    return _original_deepcopy(x, memo, _nil)
+
+
+def _start_counting_deepcopy():
+    global _deepcopy_users, _original_deepcopy
+    with _deepcopy_lock:
+        if not _deepcopy_users:
+            _original_deepcopy = copy.deepcopy
+            copy.deepcopy = _counting_deepcopy
+        _deepcopy_users += 1
+
+
+def _stop_counting_deepcopy():
+    global _deepcopy_users
+    with _deepcopy_lock:
+        _deepcopy_users -= 1
+        if not _deepcopy_users and copy.deepcopy is _counting_deepcopy:
+            copy.deepcopy = _original_deepcopy
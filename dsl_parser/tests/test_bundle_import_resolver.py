@@ -0,0 +1,96 @@
+########
+# Copyright (c) 2015 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+#    * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    * See the License for the specific language governing permissions and
+#    * limitations under the License.
+
+import os
+import zipfile
+
+from dsl_parser import exceptions
+from dsl_parser.import_resolver.abstract_import_resolver import \
+    AbstractImportResolver
+from dsl_parser.import_resolver.bundle_import_resolver import (
+    BundleImportResolver,
+    BundleResolverValidationException,
+    build_bundle)
+from dsl_parser.tests.abstract_test_parser import AbstractTestParser
+
+TYPES_URL = 'http://www.example.org/spec/types.yaml'
+PLUGIN_URL = 'http://www.example.org/spec/plugin.yaml'
+
+
+class TestBundleImportResolver(AbstractTestParser):
+
+    def setUp(self):
+        super(TestBundleImportResolver, self).setUp()
+        remote_imports = {
+            TYPES_URL: u"""
+imports:
+    -   {0}
+node_types:
+    test_type:
+        properties:
+            key:
+                default: "d\xe9fault"
+""".format(PLUGIN_URL),
+            PLUGIN_URL: self.BASIC_PLUGIN}
+
+        class RemoteResolver(AbstractImportResolver):
+            def resolve(self, import_url):
+                return remote_imports[import_url]
+
+        self.remote_resolver = RemoteResolver()
+        self.dsl_string = self.BASIC_VERSION_SECTION_DSL_1_0 + """
+imports:
+    -   {0}
+""".format(TYPES_URL) + self.BASIC_NODE_TEMPLATES_SECTION
+
+    def _build_bundle(self, bundle_name):
+        bundle_path = os.path.join(self._temp_dir, bundle_name)
+        bundled = build_bundle(self.make_yaml_file(self.dsl_string),
+                               bundle_path,
+                               resolver=self.remote_resolver)
+        self.assertEqual([PLUGIN_URL, TYPES_URL], bundled)
+        return bundle_path
+
+    def test_parse_with_bundle(self):
+        expected = self.parse(self.dsl_string, resolver=self.remote_resolver)
+        for bundle_name in ['bundle.zip', 'bundle.tar']:
+            resolver = BundleImportResolver(self._build_bundle(bundle_name))
+            self.assertEqual(expected,
+                             self.parse(self.dsl_string, resolver=resolver))
+            resolver.close()
+
+    def test_stored_zip_members(self):
+        bundle_path = os.path.join(self._temp_dir, 'bundle.zip')
+        with zipfile.ZipFile(bundle_path, 'w', zipfile.ZIP_STORED) as bundle:
+            bundle.writestr('spec/types.yaml', 'types')
+            bundle.writestr('www.example.org/spec/plugin.yaml', 'plugin')
+        resolver = BundleImportResolver(
+            bundle_path, rules=[{'http://www.example.org/spec': 'spec'}])
+        self.assertEqual('types', resolver.resolve(TYPES_URL))
+        self.assertEqual('plugin', resolver.resolve(PLUGIN_URL))
+        ex = self.assertRaises(exceptions.DSLParsingLogicException,
+                               resolver.resolve,
+                               'http://www.example.org/missing.yaml')
+        self.assertEqual(13, ex.err_code)
+        self.assertIn('it is not in the bundle', str(ex))
+
+    def test_invalid_bundle(self):
+        bundle_path = self.make_yaml_file('not a bundle')
+        self.assertRaises(BundleResolverValidationException,
+                          BundleImportResolver, bundle_path)
+        self.assertRaises(BundleResolverValidationException,
+                          BundleImportResolver,
+                          self._build_bundle('bundle.zip'),
+                          rules='rules')
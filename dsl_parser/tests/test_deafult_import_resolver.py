@@ -18,11 +18,13 @@ import requests
 
 import testtools
 
+from dsl_parser import utils
 from dsl_parser.exceptions import DSLParsingLogicException
 from dsl_parser.import_resolver.default_import_resolver import \
     DefaultImportResolver, DefaultResolverValidationException
 from dsl_parser.import_resolver.abstract_import_resolver import \
-    DEFAULT_NUMBER_RETRIES
+    AbstractImportResolver, RetryPolicy, DEFAULT_NUMBER_RETRIES, \
+    DEFAULT_POOL_MAXSIZE
 
 ORIGINAL_V1_URL = 'http://www.original_v1.org/cloudify/types.yaml'
 ORIGINAL_V1_PREFIX = 'http://www.original_v1.org'
@@ -185,7 +187,7 @@ class TestDefaultResolver(testtools.TestCase):
 
         class mock_requests_get(object):
 
-            def __init__(self, url, timeout):
+            def __init__(self, url, timeout, headers=None):
                 self.status_code = 200
                 self.text = 200
                 number_of_attempts.append(1)
@@ -214,7 +216,7 @@ class TestDefaultResolver(testtools.TestCase):
                         return None
 
         resolver = DefaultImportResolver(rules=rules)
-        with mock.patch('requests.get', new=mock_requests_get,
+        with mock.patch('requests.Session.get', new=mock_requests_get,
                         create=True):
             with mock.patch(
                     'dsl_parser.import_resolver.abstract_import_resolver.'
@@ -298,3 +300,110 @@ class TestDefaultResolverValidations(testtools.TestCase):
             self.assertIn(
                 'got an unexpected keyword argument \'wrong_param_name\'',
                 str(ex))
+
+    def test_illegal_default_resolver_pool_size(self):
+        for pool_size in [0, '10', True]:
+            ex = self.assertRaises(DefaultResolverValidationException,
+                                   DefaultImportResolver,
+                                   pool_maxsize=pool_size)
+            self.assertIn('The `pool_maxsize` parameter must be a positive '
+                          'integer', str(ex))
+
+
+class TestResolverSession(testtools.TestCase):
+
+    def test_pool_configuration(self):
+        resolver = DefaultImportResolver(pool_connections=2, pool_maxsize=3)
+        session = resolver.session
+        self.assertIs(session, resolver.session)
+        self.assertIsNot(session, DefaultImportResolver().session)
+        for url in ['http://host/types.yaml', 'https://host/types.yaml']:
+            adapter = session.get_adapter(url)
+            self.assertEqual(2, adapter._pool_connections)
+            self.assertEqual(3, adapter._pool_maxsize)
+
+    def test_subclass_session(self):
+        class CustomImportResolver(AbstractImportResolver):
+            def __init__(self):
+                pass
+
+            def resolve(self, import_url):
+                return self.session.get(import_url).text
+
+        resolver = CustomImportResolver()
+        adapter = resolver.session.get_adapter('http://host/types.yaml')
+        self.assertEqual(DEFAULT_POOL_MAXSIZE, adapter._pool_maxsize)
+
+    def test_url_exists(self):
+        session = mock.Mock()
+        session.head.return_value = mock.Mock(status_code=200, ok=True)
+        self.assertTrue(utils.url_exists(VALID_V1_URL, session))
+        self.assertFalse(session.get.called)
+
+        session.head.return_value = mock.Mock(status_code=405, ok=False)
+        session.get.return_value = mock.Mock(status_code=200, ok=True)
+        self.assertTrue(utils.url_exists(VALID_V1_URL, session))
+        self.assertTrue(session.get.return_value.close.called)
+
+        session.head.side_effect = requests.ConnectionError()
+        self.assertFalse(utils.url_exists(VALID_V1_URL, session))
+
+
+class TestRetryPolicy(testtools.TestCase):
+
+    def test_illegal_default_resolver_retry_policy(self):
+        for retry_policy in [{'wrong_param_name': 1}, 'policy']:
+            ex = self.assertRaises(DefaultResolverValidationException,
+                                   DefaultImportResolver,
+                                   retry_policy=retry_policy)
+            self.assertIn('The `retry_policy` parameter must be a '
+                          'dictionary', str(ex))
+
+    def test_backoff(self):
+        policy = RetryPolicy(max_retries=4, base_delay=1, max_delay=3,
+                             jitter=0)
+        self.assertEqual([1, 2, 3, 3, None],
+                         [policy.retry_delay(attempt)
+                          for attempt in range(5)])
+        policy.jitter = 0.5
+        for _ in range(10):
+            self.assertTrue(1 <= policy.retry_delay(1) <= 2)
+
+    def test_deadline(self):
+        policy = RetryPolicy(base_delay=1, jitter=0, deadline=0.5,
+                             request_timeout=5)
+        budget = policy.budget()
+        self.assertEqual(5, budget.request_timeout(0))
+        self.assertTrue(budget.request_timeout(1) <= 0.5)
+        self.assertIsNone(budget.retry_delay(0))
+        self.assertEqual(1, policy.retry_delay(0))
+        self.assertEqual(5, policy.request_timeout(1))
+
+    def test_failed_host(self):
+        requested_urls = []
+
+        def get(session, url, timeout, headers=None):
+            requested_urls.append(url)
+            if url.startswith(VALID_V1_PREFIX):
+                raise requests.ConnectionError('connection refused')
+            return mock.Mock(status_code=200, text=url)
+
+        resolver = DefaultImportResolver(
+            rules=[{ORIGINAL_V1_PREFIX: VALID_V1_PREFIX}],
+            retry_policy={'max_retries': 1, 'base_delay': 0})
+        first_url = ORIGINAL_V1_PREFIX + '/first.yaml'
+        second_url = ORIGINAL_V1_PREFIX + '/second.yaml'
+        with mock.patch('requests.Session.get', new=get):
+            budget = resolver.retry_policy.budget()
+            for url in [first_url, second_url]:
+                self.assertEqual(
+                    url, resolver.fetch_import(url, retry_budget=budget))
+            self.assertEqual([VALID_V1_PREFIX + '/first.yaml',
+                              VALID_V1_PREFIX + '/first.yaml',
+                              first_url,
+                              second_url], requested_urls)
+
+            # the failed host is not known to other budgets
+            self.assertEqual(second_url, resolver.resolve(second_url))
+            self.assertEqual(VALID_V1_PREFIX + '/second.yaml',
+                             requested_urls[4])
@@ -13,6 +13,8 @@
 #    * See the License for the specific language governing permissions and
 #    * limitations under the License.
 
+from multiprocessing.pool import ThreadPool
+
 import testtools
 
 from dsl_parser import exceptions
@@ -117,6 +119,25 @@ class TestSchemaSchemaValidation(testtools.TestCase):
             schema = [1]
         self.assert_invalid(TestList)
 
+    def test_invalid_schema_referencing_validated_schema(self):
+        class TestLeaf(elements.Element):
+            schema = elements.Leaf(type=str)
+
+        class TestElement(elements.Element):
+            schema = {'leaf': TestLeaf, 'invalid': 1}
+
+        parser.validate_schema_api(TestLeaf)
+        self.assert_invalid(TestElement)
+        self.assert_invalid(TestElement)
+
+    def test_invalid_schema_replaced_after_validation(self):
+        class TestElement(elements.Element):
+            schema = elements.Leaf(type=str)
+
+        parser.validate_schema_api(TestElement)
+        TestElement.schema = 1
+        self.assert_invalid(TestElement)
+
 
 class TestSchemaValidation(testtools.TestCase):
 
@@ -313,3 +334,196 @@ class TestSchemaValidation(testtools.TestCase):
             {'child': 'value'},
             TestElement,
             error_code=exceptions.ERROR_CODE_ILLEGAL_VALUE_ACCESS)
+
+    def test_illegal_value_modification(self):
+        class ChildElement(elements.Element):
+            schema = elements.Leaf(type=dict)
+
+            def parse(self):
+                self.initial_value['nested'].append(2)
+
+        class TestElement(elements.Element):
+            schema = {
+                'child': ChildElement
+            }
+
+        self.assert_invalid(
+            {'child': {'nested': [1]}},
+            TestElement,
+            error_code=exceptions.ERROR_CODE_ILLEGAL_VALUE_MODIFICATION)
+
+    def test_parsed_value_is_modifiable(self):
+        class TestElement(elements.Element):
+            schema = elements.Leaf(type=dict)
+
+        value = {'nested': {'list': [1]}}
+        result = parser.parse(value=value, element_cls=TestElement)
+        self.assertEqual(value, result)
+        result['nested']['list'].append(2)
+        result['key'] = 'value'
+        self.assertEqual({'nested': {'list': [1]}}, value)
+
+    def test_element_tree_navigation(self):
+        class Leaf(elements.Element):
+            schema = elements.Leaf(type=int)
+
+        class Middle(elements.DictElement):
+            schema = elements.List(type=Leaf)
+
+        class TestElement(elements.DictElement):
+            schema = {
+                'middle': Middle
+            }
+
+        context = parser.Context(value={'middle': [1, 2]},
+                                 element_cls=TestElement,
+                                 element_name='root',
+                                 inputs=None)
+        root = context.element_type_to_elements[TestElement][0]
+        middle = root.child(Middle)
+        leaves = middle.children()
+        self.assertEqual([0, 1], [leaf.name for leaf in leaves])
+        self.assertIs(middle, leaves[1].parent())
+        self.assertIs(root, leaves[1].ancestor(TestElement))
+        self.assertEqual('middle.1', leaves[1].path)
+        self.assertEqual([middle] + leaves, root.descendants(
+            elements.Element))
+        self.assertEqual([root, middle],
+                         list(reversed(list(context.ancestors_iter(
+                             leaves[0])))))
+
+    def _key_predicate_elements(self, ref_requirement):
+        class TestTarget(elements.Element):
+            schema = elements.Leaf(type=str)
+
+        class TestTargets(elements.DictElement):
+            schema = elements.Dict(type=TestTarget)
+
+        class TestRef(elements.Element):
+            schema = elements.Leaf(type=[str, list])
+            requires = {
+                TestTarget: [ref_requirement]
+            }
+
+            def parse(self, target):
+                return target
+
+        class TestRefs(elements.Element):
+            schema = elements.List(type=TestRef)
+
+            def parse(self):
+                return [c.value for c in sorted(self.children(),
+                                                key=lambda c: c.index)]
+
+        class TestElement(elements.DictElement):
+            schema = {
+                'targets': TestTargets,
+                'refs': TestRefs
+            }
+        return TestElement
+
+    def test_key_predicate_requirement(self):
+        element_cls = self._key_predicate_elements(requirements.Value(
+            'target',
+            required=False,
+            predicate=requirements.KeyPredicate(
+                source_key=lambda source: source.initial_value)))
+        result = parser.parse(value={'targets': {'a': 'A', 'b': 'B'},
+                                     'refs': ['b', 'a', 'c']},
+                              element_cls=element_cls)
+        self.assertEqual(['B', 'A', None], result['refs'])
+
+    def test_key_predicate_requirement_multiple_keys(self):
+        element_cls = self._key_predicate_elements(requirements.Value(
+            'target',
+            multiple_results=True,
+            predicate=requirements.KeyPredicate(
+                source_key=lambda source: source.initial_value,
+                multiple_keys=True)))
+        result = parser.parse(value={'targets': {'a': 'A', 'b': 'B'},
+                                     'refs': [['a', 'b', 'c'], ['b'], []]},
+                              element_cls=element_cls)
+        self.assertEqual(['A', 'B'], sorted(result['refs'][0]))
+        self.assertEqual([['B'], []], result['refs'][1:])
+
+    def test_key_predicate_requirement_with_predicate_fallback(self):
+        key_predicate = requirements.KeyPredicate(
+            source_key=lambda source: source.initial_value,
+            multiple_keys=True)
+
+        def not_b(source, target):
+            return target.name != 'b'
+
+        element_cls = self._key_predicate_elements(requirements.Value(
+            'target',
+            multiple_results=True,
+            predicate=lambda source, target: (key_predicate(source, target) and
+                                              not_b(source, target))))
+        result = parser.parse(value={'targets': {'a': 'A', 'b': 'B'},
+                                     'refs': [['a', 'b']]},
+                              element_cls=element_cls)
+        self.assertEqual([['A']], result['refs'])
+
+    def _executor_elements(self, processed, failing=()):
+        class TestLeaf(elements.Element):
+            schema = elements.Leaf(type=int)
+
+            def validate(self):
+                if self.name in failing:
+                    raise exceptions.DSLParsingLogicException(
+                        self.initial_value, self.name)
+
+            def parse(self):
+                processed.append(self.name)
+                return self.initial_value
+
+        class TestDependent(elements.Element):
+            schema = elements.Leaf(type=int)
+            requires = {
+                TestLeaf: [requirements.Value('leafs',
+                                              multiple_results=True)]
+            }
+
+            def validate(self, leafs):
+                if self.name in failing:
+                    raise exceptions.DSLParsingLogicException(
+                        self.initial_value, self.name)
+
+            def parse(self, leafs):
+                processed.append(self.name)
+                return self.initial_value + sum(leafs)
+
+        class TestElement(elements.DictElement):
+            schema = {
+                'leaf1': TestLeaf,
+                'leaf2': TestLeaf,
+                'dependent': TestDependent
+            }
+        return TestElement
+
+    def test_executor_processing(self):
+        pool = ThreadPool(4)
+        self.addCleanup(pool.terminate)
+        processed = []
+        result = parser.parse(value={'leaf1': 1, 'leaf2': 2, 'dependent': 3},
+                              element_cls=self._executor_elements(processed),
+                              executor=pool)
+        self.assertEqual({'leaf1': 1, 'leaf2': 2, 'dependent': 6}, result)
+        self.assertEqual(['leaf1', 'leaf2'], sorted(processed[:2]))
+        self.assertEqual('dependent', processed[2])
+
+    def test_executor_processing_error(self):
+        pool = ThreadPool(4)
+        self.addCleanup(pool.terminate)
+        processed = []
+        element_cls = self._executor_elements(
+            processed, failing=('leaf2', 'dependent'))
+        ex = self.assertRaises(
+            exceptions.DSLParsingLogicException,
+            parser.parse,
+            value={'leaf1': 1, 'leaf2': 2, 'dependent': 3},
+            element_cls=element_cls,
+            executor=pool)
+        self.assertEqual(2, ex.err_code)
+        self.assertEqual('leaf2', ex.element.name)
+        self.assertNotIn('dependent', processed)
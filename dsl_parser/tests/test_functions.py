@@ -16,6 +16,9 @@
 from testtools import ExpectedException
 
 from dsl_parser import exceptions
+from dsl_parser import functions
+from dsl_parser import models
+from dsl_parser import scan
 from dsl_parser.tasks import prepare_deployment_plan
 from dsl_parser.tests.abstract_test_parser import AbstractTestParser
 from dsl_parser.tests.abstract_test_parser import timeout
@@ -651,6 +654,39 @@ node_templates:
                           'vm.b,b0 -> vm.a,a0 -> vm.b,b0',
                           str(e))
 
+    def test_plan_node_template_index(self):
+        plan = models.Plan({'nodes': [{'id': 'vm1'}, {'id': 'vm2'}]})
+        self.assertEqual({'id': 'vm2'}, plan.get_node_template('vm2'))
+        self.assertIsNone(plan.get_node_template('vm3'))
+        plan.node_templates.append({'id': 'vm3'})
+        self.assertEqual({'id': 'vm3'}, plan.get_node_template('vm3'))
+        plan.node_templates[0] = {'id': 'vm4'}
+        self.assertIsNone(plan.get_node_template('vm1'))
+        self.assertEqual({'id': 'vm4'}, plan.get_node_template('vm4'))
+        plan['nodes'] = [{'id': 'vm1', 'key': 'value'}]
+        self.assertEqual({'id': 'vm1', 'key': 'value'},
+                         plan.get_node_template('vm1'))
+        self.assertIsNone(plan.get_node_template('vm2'))
+        # misses do not rebuild the index
+        index_entry = plan.__dict__['_node_templates_index_entry']
+        self.assertIsNone(plan.get_node_template('vm5'))
+        self.assertIs(index_entry,
+                      plan.__dict__['_node_templates_index_entry'])
+
+    def test_missing_relationship_target(self):
+        plan = models.Plan({'nodes': [{'id': 'vm1', 'name': 'vm1',
+                                       'properties': {'a': 1}}]})
+        function = functions.GetProperty(
+            ['TARGET', 'a'],
+            scope=scan.NODE_TEMPLATE_RELATIONSHIP_SCOPE,
+            context={'relationship': {'target_id': 'vm2'}},
+            path='relationships[0].properties.a')
+        ex = self.assertRaises(KeyError, function.evaluate, plan)
+        self.assertIn("reference 'vm2' does not exist", str(ex))
+
+        function.context['relationship']['target_id'] = 'vm1'
+        self.assertEqual(1, function.evaluate(plan))
+
 
 class TestGetAttribute(AbstractTestParser):
 
@@ -0,0 +1,127 @@
+########
+# Copyright (c) 2015 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+#    * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    * See the License for the specific language governing permissions and
+#    * limitations under the License.
+
+import testtools
+
+from dsl_parser import exceptions
+from dsl_parser.holder import Holder
+
+
+class TestHolder(testtools.TestCase):
+
+    def test_get_item(self):
+        holder = Holder.of({'a': 1, 'b': {'c': 2}})
+        key_holder, value_holder = holder.get_item('b')
+        self.assertEqual('b', key_holder.value)
+        self.assertEqual({'c': 2}, value_holder.restore())
+        self.assertIn('a', holder)
+        self.assertNotIn('d', holder)
+        self.assertEqual((None, None), holder.get_item('d'))
+        self.assertEqual((None, None), holder.get_item(['unhashable']))
+
+    def test_get_item_after_mutation(self):
+        holder = Holder.of({'a': 1})
+        self.assertNotIn('b', holder)
+
+        holder.set_item(Holder('b'), Holder(2))
+        self.assertEqual(2, holder.get_item('b')[1].value)
+
+        holder.value[Holder('c')] = Holder(3)
+        self.assertEqual(3, holder.get_item('c')[1].value)
+
+        key_holder, _ = holder.get_item('a')
+        holder.value[key_holder] = Holder(4)
+        self.assertEqual(4, holder.get_item('a')[1].value)
+
+        del holder.value[key_holder]
+        holder.value[Holder('d')] = Holder(5)
+        self.assertNotIn('a', holder)
+        self.assertIn('d', holder)
+
+        # removed without changing the size of the dict
+        key_holder, _ = holder.get_item('d')
+        del holder.value[key_holder]
+        holder.value[Holder('f')] = Holder(7)
+        self.assertNotIn('d', holder)
+
+        holder.value = {Holder('e'): Holder(6)}
+        self.assertNotIn('b', holder)
+        self.assertEqual(6, holder.get_item('e')[1].value)
+
+    def test_get_item_unhashable_key(self):
+        holder = Holder({Holder(('a', 'b')): Holder(1),
+                         Holder('c'): Holder(2)})
+        holder.value[Holder([1, 2])] = Holder(3)
+        self.assertEqual(2, holder.get_item('c')[1].value)
+        self.assertEqual(3, holder.get_item([1, 2])[1].value)
+        self.assertEqual(1, holder.get_item(('a', 'b'))[1].value)
+
+    def test_restore_shares_structure(self):
+        holder = Holder.of({'a': {'b': [1, {'c': 2}]}})
+        _, a_holder = holder.get_item('a')
+        restored = holder.restore()
+        self.assertEqual({'a': {'b': [1, {'c': 2}]}}, restored)
+        self.assertIs(restored, holder.restore())
+        self.assertIs(restored['a'], a_holder.restore())
+        ex = self.assertRaises(exceptions.DSLParsingSchemaAPIException,
+                               restored['a']['b'].append, 3)
+        self.assertEqual(
+            exceptions.ERROR_CODE_ILLEGAL_VALUE_MODIFICATION, ex.err_code)
+
+    def test_restore_after_mutation(self):
+        holder = Holder.of({'a': {'b': 1}})
+        _, a_holder = holder.get_item('a')
+        self.assertEqual({'a': {'b': 1}}, holder.restore())
+
+        a_holder.set_item(Holder('c'), Holder(2))
+        self.assertEqual({'a': {'b': 1, 'c': 2}}, holder.restore())
+
+        _, b_holder = a_holder.get_item('b')
+        b_holder.value = 3
+        self.assertEqual({'a': {'b': 3, 'c': 2}}, holder.restore())
+
+    def test_restore_after_direct_mutation(self):
+        holder = Holder.of({'a': 1, 'b': [1, 2]})
+        other = Holder.of({'c': 3})
+        other_restored = other.restore()
+        self.assertEqual({'a': 1, 'b': [1, 2]}, holder.restore())
+
+        holder.value[Holder('c')] = Holder(2)
+        self.assertEqual({'a': 1, 'b': [1, 2], 'c': 2}, holder.restore())
+
+        key_holder, _ = holder.get_item('a')
+        holder.value[key_holder] = Holder(4)
+        self.assertEqual({'a': 4, 'b': [1, 2], 'c': 2}, holder.restore())
+
+        _, b_holder = holder.get_item('b')
+        b_holder.value[0] = Holder(5)
+        self.assertEqual({'a': 4, 'b': [5, 2], 'c': 2}, holder.restore())
+
+        # mutations of other holders keep the restored value
+        self.assertIs(other_restored, other.restore())
+
+    def test_marks(self):
+        for marks in [(0, 0, 0, 0),
+                      (1, 2, 3, 4),
+                      (100000, 4095, 104095, 4095),
+                      (5, 10000, 5, 20000),
+                      (5, 1, 10000, 1),
+                      (None, None, None, None)]:
+            holder = Holder('value', *marks, filename='file')
+            for h in [holder, holder.copy()]:
+                self.assertEqual(marks, (h.start_line, h.start_column,
+                                         h.end_line, h.end_column))
+                self.assertEqual('file', h.filename)
+        self.assertFalse(hasattr(Holder('value'), '__dict__'))
@@ -0,0 +1,126 @@
+########
+# Copyright (c) 2015 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+#    * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    * See the License for the specific language governing permissions and
+#    * limitations under the License.
+
+import BaseHTTPServer
+import os
+import shutil
+import tempfile
+import threading
+
+import mock
+import testtools
+
+from dsl_parser.exceptions import DSLParsingLogicException
+from dsl_parser.import_resolver.default_import_resolver import \
+    DefaultImportResolver
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path,
+                                self.headers.getheader('If-None-Match')))
+        if self.path not in server.resources:
+            self.send_response(404)
+            self.end_headers()
+            return
+        body, etag, cache_control = server.resources[self.path]
+        not_modified = etag and \
+            self.headers.getheader('If-None-Match') == etag
+        if not_modified:
+            self.send_response(304)
+        else:
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        if cache_control:
+            self.send_header('Cache-Control', cache_control)
+        self.end_headers()
+        if not not_modified:
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHttpCache(testtools.TestCase):
+
+    def setUp(self):
+        super(TestHttpCache, self).setUp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        self.server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), _Handler)
+        self.server.requests = []
+        self.server.resources = {}
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self._stop_server)
+        self.url = 'http://127.0.0.1:{0}/types.yaml'.format(
+            self.server.server_port)
+
+    def _stop_server(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def _resolve(self, **kwargs):
+        resolver = DefaultImportResolver(cache_dir=self.cache_dir, **kwargs)
+        return resolver.resolve(self.url)
+
+    def test_revalidation(self):
+        self.server.resources['/types.yaml'] = ('v1', '"1"', None)
+        self.assertEqual('v1', self._resolve())
+        self.assertEqual('v1', self._resolve())
+        self.assertEqual([('/types.yaml', None), ('/types.yaml', '"1"')],
+                         self.server.requests)
+
+        self.server.resources['/types.yaml'] = ('v2', '"2"', None)
+        self.assertEqual('v2', self._resolve())
+        self.assertEqual('v2', self._resolve())
+        self.assertEqual(('/types.yaml', '"2"'), self.server.requests[-1])
+
+    def test_max_age(self):
+        self.server.resources['/types.yaml'] = ('v1', '"1"', 'max-age=60')
+        self.assertEqual('v1', self._resolve())
+        self.server.resources['/types.yaml'] = ('v2', '"2"', 'max-age=60')
+        self.assertEqual('v1', self._resolve())
+        self.assertEqual(1, len(self.server.requests))
+
+    def test_no_cache(self):
+        self.server.resources['/types.yaml'] = ('v1', '"1"',
+                                                'no-cache, max-age=60')
+        self.assertEqual('v1', self._resolve())
+        self.assertEqual('v1', self._resolve())
+        self.assertEqual([('/types.yaml', None), ('/types.yaml', '"1"')],
+                         self.server.requests)
+
+    def test_no_store(self):
+        self.server.resources['/types.yaml'] = ('v1', '"1"', 'no-store')
+        self.assertEqual('v1', self._resolve())
+        self.assertEqual([], os.listdir(self.cache_dir))
+
+    def test_serve_stale(self):
+        self.server.resources['/types.yaml'] = ('v1', '"1"', None)
+        self.assertEqual('v1', self._resolve())
+        self._stop_server()
+        with mock.patch(
+                'dsl_parser.import_resolver.abstract_import_resolver.'
+                'DEFAULT_RETRY_DELAY', new=0):
+            self.assertEqual('v1', self._resolve(serve_stale=True))
+            self.assertRaises(DSLParsingLogicException, self._resolve)
@@ -0,0 +1,133 @@
+########
+# Copyright (c) 2015 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+#    * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    * See the License for the specific language governing permissions and
+#    * limitations under the License.
+
+import mock
+
+from dsl_parser import exceptions
+from dsl_parser.parser import ParseSession
+from dsl_parser.framework import parser as framework_parser
+from dsl_parser.tests.abstract_test_parser import AbstractTestParser
+
+
+class TestParseSession(AbstractTestParser):
+
+    BLUEPRINT = AbstractTestParser.BASIC_VERSION_SECTION_DSL_1_2 + """
+plugins:
+    test_plugin:
+        executor: central_deployment_agent
+        source: dummy
+data_types:
+    pair:
+        properties:
+            first: {}
+            second:
+                default: 2
+node_types:
+    test_type:
+        properties:
+            key:
+                default: 'default'
+            pair:
+                type: pair
+                default:
+                    first: 1
+        interfaces:
+            test_interface:
+                install: test_plugin.install
+    derived_type:
+        derived_from: test_type
+relationships:
+    cloudify.relationships.depends_on: {}
+node_templates:
+    node1:
+        type: test_type
+        properties:
+            key: val1
+    node2:
+        type: derived_type
+        relationships:
+            - type: cloudify.relationships.depends_on
+              target: node1
+outputs:
+    output:
+        value: {get_property: [node1, key]}
+"""
+
+    def _assert_session_parse(self, session, dsl_string):
+        plan = session.parse(dsl_string)
+        self.assertEqual(self.parse(dsl_string), plan)
+        return plan
+
+    def test_session_parse_equals_full_parse(self):
+        edits = [
+            self.BLUEPRINT,
+            self.BLUEPRINT.replace('key: val1', 'key: val2'),
+            self.BLUEPRINT.replace('first: 1', 'first: 3'),
+            self.BLUEPRINT.replace('default: 2', 'default: 2.0'),
+            self.BLUEPRINT.replace('target: node1', 'target: node3')
+            .replace('outputs:', """
+    node3:
+        type: derived_type
+outputs:"""),
+            self.BLUEPRINT.replace('derived_from: test_type',
+                                   'properties: {}'),
+            self.BLUEPRINT.replace('install: test_plugin.install',
+                                   'install: test_plugin.configure'),
+            self.BLUEPRINT
+        ]
+        session = ParseSession()
+        for dsl_string in edits:
+            self._assert_session_parse(session, dsl_string)
+
+    @staticmethod
+    def _blueprint_elements(session, elements):
+        context = session._context
+        return [e for e in elements if e.context is context]
+
+    def test_unaffected_elements_are_not_processed(self):
+        session = ParseSession()
+        session.parse(self.BLUEPRINT)
+        original_process_element = framework_parser.Parser._process_element
+        processed = []
+
+        def process_element(parser, element):
+            processed.append(element)
+            return original_process_element(parser, element)
+
+        with mock.patch.object(framework_parser.Parser, '_process_element',
+                               process_element):
+            self._assert_session_parse(session, self.BLUEPRINT)
+            self.assertEqual([], self._blueprint_elements(session,
+                                                          processed))
+
+            del processed[:]
+            self._assert_session_parse(
+                session, self.BLUEPRINT.replace('key: val1', 'key: val2'))
+            processed_paths = set(
+                e.path for e in self._blueprint_elements(session, processed))
+            self.assertIn('node_templates.node1.properties', processed_paths)
+            self.assertNotIn('node_types.test_type', processed_paths)
+            self.assertNotIn('node_templates.node2.type', processed_paths)
+
+    def test_failed_parse_keeps_previous_results(self):
+        session = ParseSession()
+        self._assert_session_parse(session, self.BLUEPRINT)
+        ex = self.assertRaises(
+            exceptions.DSLParsingLogicException,
+            session.parse,
+            self.BLUEPRINT.replace('target: node1', 'target: node3'))
+        self.assertEqual(25, ex.err_code)
+        self._assert_session_parse(
+            session, self.BLUEPRINT.replace('key: val1', 'key: val3'))
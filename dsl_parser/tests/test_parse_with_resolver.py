@@ -13,6 +13,11 @@
 #    * See the License for the specific language governing permissions and
 #    * limitations under the License.
 
+import threading
+import time
+
+from dsl_parser import exceptions
+from dsl_parser.elements import imports as imports_module
 from dsl_parser.tests.abstract_test_parser import AbstractTestParser
 from dsl_parser.import_resolver.abstract_import_resolver import \
     AbstractImportResolver
@@ -61,3 +66,89 @@ imports:
         self.assertEqual(len(urls), 2)
         self.assertIn('http://url1', urls)
         self.assertIn('http://url2', urls)
+
+    def test_parse_using_resolver_concurrently(self):
+        imports = ['http://url{0}'.format(i) for i in range(16)]
+        yaml_to_parse = """
+node_templates:
+    node:
+        type: resolver_type_0
+imports:
+""" + ''.join('    -   {0}\n'.format(url) for url in imports)
+        lock = threading.Lock()
+        running = [0]
+        max_running = [0]
+
+        class CustomResolver(AbstractImportResolver):
+            def resolve(self, url):
+                with lock:
+                    running[0] += 1
+                    max_running[0] = max(max_running[0], running[0])
+                time.sleep(0.05)
+                with lock:
+                    running[0] -= 1
+                index = imports.index(url)
+                return """
+node_types:
+    resolver_type_{0}: {{}}
+""".format(index)
+        self.parse(yaml_to_parse, resolver=CustomResolver())
+        self.assertLess(1, max_running[0])
+        self.assertGreaterEqual(imports_module.IMPORTS_FETCH_THREADS,
+                                max_running[0])
+
+    def test_parse_using_resolver_concurrently_error(self):
+        imports = ['http://slow{0}'.format(i) for i in range(32)]
+        yaml_to_parse = """
+imports:
+    -   http://fails
+""" + ''.join('    -   {0}\n'.format(url) for url in imports)
+        resolved_urls = []
+
+        class CustomResolver(AbstractImportResolver):
+            def resolve(self, url):
+                if url == 'http://fails':
+                    raise exceptions.DSLParsingLogicException(13, url)
+                time.sleep(0.05)
+                resolved_urls.append(url)
+                return 'node_types: {}'
+
+        self.assertRaises(exceptions.DSLParsingLogicException,
+                          self.parse, yaml_to_parse, resolver=CustomResolver())
+        # the queued fetches were cancelled, and the running ones joined
+        resolved_count = len(resolved_urls)
+        self.assertLess(resolved_count, len(imports))
+        time.sleep(0.1)
+        self.assertEqual(resolved_count, len(resolved_urls))
+        self.assertIs(imports_module._get_fetch_pool(),
+                      imports_module._get_fetch_pool())
+
+    def test_parse_using_resolver_concurrently_error_order(self):
+        yaml_to_parse = """
+imports:
+    -   http://slow
+    -   http://fails
+"""
+
+        class CustomResolver(AbstractImportResolver):
+            def resolve(self, url):
+                if url == 'http://slow':
+                    time.sleep(0.1)
+                    return """
+imports:
+    -   http://nested
+"""
+                raise exceptions.DSLParsingLogicException(13, url)
+        resolver = CustomResolver()
+        ex = self.assertRaises(exceptions.DSLParsingLogicException,
+                               self.parse, yaml_to_parse, resolver=resolver)
+        self.assertEqual('http://nested', ex.message)
+
+        yaml_to_parse = """
+imports:
+    -   http://fails
+    -   relative_missing
+"""
+        ex = self.assertRaises(exceptions.DSLParsingLogicException,
+                               self.parse, yaml_to_parse, resolver=resolver)
+        self.assertEqual('http://fails', ex.message)
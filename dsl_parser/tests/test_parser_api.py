@@ -17,6 +17,7 @@ import os
 import socket
 import StringIO
 import yaml as yml
+import mock
 from urllib2 import HTTPError
 from urllib import pathname2url
 
@@ -24,9 +25,12 @@ from dsl_parser import exceptions
 from dsl_parser import constants
 from dsl_parser import version
 from dsl_parser import models
+from dsl_parser import utils
+from dsl_parser.elements import types
 from dsl_parser.tests.abstract_test_parser import AbstractTestParser
 from dsl_parser.parser import parse_from_path, parse_from_url
 from dsl_parser.parser import parse as dsl_parse
+from dsl_parser.interfaces import interfaces_parser
 from dsl_parser.interfaces.constants import NO_OP
 from dsl_parser.interfaces.utils import operation_mapping
 from dsl_parser.constants import TYPE_HIERARCHY
@@ -2608,6 +2612,78 @@ node_types:
         result = self.parse(yaml)
         self._assert_blueprint(result)
 
+    def test_node_interfaces_shared_between_templates(self):
+        yaml = self.BASIC_PLUGIN + """
+node_types:
+    test_type:
+        interfaces:
+            test_interface1:
+                install: test_plugin.install
+                terminate: test_plugin.terminate
+node_templates:
+    node1:
+        type: test_type
+    node2:
+        type: test_type
+    node3:
+        type: test_type
+        interfaces:
+            test_interface1:
+                install: test_plugin.other_install
+"""
+        merge = interfaces_parser.merge_node_type_and_node_template_interfaces
+        with mock.patch.object(
+                interfaces_parser,
+                'merge_node_type_and_node_template_interfaces',
+                side_effect=merge) as merge_mock:
+            result = self.parse(yaml)
+        self.assertEqual(2, merge_mock.call_count)
+        nodes = dict((node['id'], node) for node in result['nodes'])
+        for node_id, install in [('node1', 'install'),
+                                 ('node2', 'install'),
+                                 ('node3', 'other_install')]:
+            operations = nodes[node_id]['operations']
+            self.assertEqual(op_struct('test_plugin', install,
+                                       executor='central_deployment_agent'),
+                             operations['install'])
+            self.assertEqual(op_struct('test_plugin', 'terminate',
+                                       executor='central_deployment_agent'),
+                             operations['test_interface1.terminate'])
+
+    def test_resolved_types_shared_between_parses(self):
+        yaml = self.BASIC_VERSION_SECTION_DSL_1_0 + """
+node_types:
+    base_type:
+        properties:
+            key:
+                default: {0}
+    test_type:
+        derived_from: base_type
+relationships:
+    base_relationship: {{}}
+    test_relationship:
+        derived_from: base_relationship
+node_templates:
+    node:
+        type: test_type
+"""
+        types.resolved_types_cache.clear()
+        merge = utils.merge_schemas
+        for default, merge_count in [('value', 2),
+                                     ('value', 0),
+                                     ('other_value', 1)]:
+            with mock.patch.object(utils, 'merge_schemas',
+                                   side_effect=merge) as merge_mock:
+                result = self.parse(yaml.format(default))
+            self.assertEqual(merge_count, merge_mock.call_count)
+            node = result['nodes'][0]
+            self.assertEqual({'key': default}, node['properties'])
+            self.assertEqual(['base_type', 'test_type'],
+                             node[TYPE_HIERARCHY])
+            self.assertEqual(['base_relationship', 'test_relationship'],
+                             result['relationships']['test_relationship'][
+                                 TYPE_HIERARCHY])
+
     def test_property_schema_type_property_with_intrinsic_functions(self):
         yaml = """
 node_templates:
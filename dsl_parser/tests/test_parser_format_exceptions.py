@@ -37,6 +37,13 @@ plugins:
         self._assert_dsl_parsing_exception_error_code(
             yaml, -1, DSLParsingFormatException)
 
+    def test_illegal_yaml_value_dsl(self):
+        yaml = """
+plugins: !unknown_tag {}
+        """
+        self._assert_dsl_parsing_exception_error_code(
+            yaml, -1, DSLParsingFormatException)
+
     def test_no_node_templates(self):
         yaml = """
 plugins:
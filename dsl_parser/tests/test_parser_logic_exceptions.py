@@ -20,6 +20,8 @@ from dsl_parser.parser import parse as dsl_parse
 from dsl_parser import exceptions
 from dsl_parser.exceptions import DSLParsingLogicException
 from dsl_parser import version
+from dsl_parser.elements import (operation,
+                                 plugins as _plugins)
 from dsl_parser.tests.abstract_test_parser import AbstractTestParser
 from dsl_parser.import_resolver.default_import_resolver import \
     DefaultImportResolver
@@ -279,6 +281,30 @@ plugins:
         self._assert_dsl_parsing_exception_error_code(
             yaml, 91, DSLParsingLogicException)
 
+    def test_ambiguous_plugin_operation_mapping_order(self):
+        mapping = 'one.two.three.four'
+        for plugins in [{'one.two': {}, 'one': {}, 'one.two.three': {},
+                         'two': {}, 'one.t': {}},
+                        {'one': {}, 'one.two.three.four': {}}]:
+            self.assertEqual(
+                [p for p in plugins.keys()
+                 if mapping.startswith('{0}.'.format(p))],
+                operation._mapping_plugins(
+                    _plugins.index_plugins(plugins), mapping))
+
+    def test_plugins_replaced_in_place(self):
+        operation_content = {'implementation': 'new.tasks.op',
+                             'inputs': {}}
+        plugins = {'old': {'executor': 'central_deployment_agent'}}
+        self.assertRaises(DSLParsingLogicException,
+                          operation.process_operation,
+                          plugins, 'op', operation_content, 10, '', None)
+        del plugins['old']
+        plugins['new'] = {'executor': 'central_deployment_agent'}
+        result = operation.process_operation(
+            plugins, 'op', operation_content, 10, '', None)
+        self.assertEqual('new', result['plugin'])
+
     def test_node_set_non_existing_property(self):
         yaml = self.BASIC_NODE_TEMPLATES_SECTION + self.BASIC_PLUGIN + """
 node_types:
@@ -480,3 +480,43 @@ plugins:
         deployment_plugins_to_install_for_plan = \
             result[constants.DEPLOYMENT_PLUGINS_TO_INSTALL]
         self.assertEquals(1, len(deployment_plugins_to_install_for_plan))
+
+    def test_shared_node_plugins(self):
+        yaml = """
+node_templates:
+    host:
+        type: cloudify.nodes.Compute
+    test_node1:
+        type: test_type
+        relationships:
+            - type: cloudify.relationships.contained_in
+              target: host
+    test_node2:
+        type: test_type
+        relationships:
+            - type: cloudify.relationships.contained_in
+              target: host
+
+node_types:
+    cloudify.nodes.Compute: {}
+    test_type:
+        interfaces:
+            test_interface:
+                start: test_plugin.start
+
+relationships:
+    cloudify.relationships.contained_in: {}
+
+plugins:
+    test_plugin:
+        executor: host_agent
+        source: dummy
+"""
+        result = self.parse(yaml)
+        nodes = dict((n['name'], n) for n in result['nodes'])
+        plugin = nodes['test_node1']['plugins'][0]
+        self.assertEqual('test_plugin', plugin['name'])
+        self.assertEqual(constants.HOST_AGENT,
+                         plugin[constants.PLUGIN_EXECUTOR_KEY])
+        self.assertEqual([plugin], nodes['test_node2']['plugins'])
+        self.assertEqual([plugin], nodes['host']['plugins_to_install'])
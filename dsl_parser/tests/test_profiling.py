@@ -0,0 +1,166 @@
+########
+# Copyright (c) 2015 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+#    * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    * See the License for the specific language governing permissions and
+#    * limitations under the License.
+
+import copy
+import threading
+from multiprocessing.pool import ThreadPool
+
+from dsl_parser import profiling
+from dsl_parser.parser import (parse as dsl_parse,
+                               parse_from_path)
+from dsl_parser.tests.abstract_test_parser import AbstractTestParser
+
+
+class TestProfiling(AbstractTestParser):
+
+    IMPORTED = """
+node_types:
+    test_type:
+        properties:
+            key:
+                default: 'default'
+"""
+
+    BLUEPRINT = """
+node_templates:
+    node1:
+        type: test_type
+        properties:
+            key: val1
+"""
+
+    def _parse(self, observer):
+        import_url = self.make_yaml_file(self.IMPORTED, as_uri=True)
+        dsl_string = self.BASIC_VERSION_SECTION_DSL_1_0 + """
+imports:
+    -   {0}
+""".format(import_url) + self.BLUEPRINT
+        return import_url, dsl_parse(dsl_string, observer=observer)
+
+    def test_profiling_collector(self):
+        collector = profiling.ProfilingCollector()
+        original_deepcopy = copy.deepcopy
+        import_url, plan = self._parse(collector)
+        self.assertIs(original_deepcopy, copy.deepcopy)
+        self.assertEqual('val1', plan.node_templates[0]['properties']['key'])
+
+        self.assertEqual(set([profiling.PHASE_LOAD_YAML,
+                              profiling.PHASE_CONTEXT_BUILD,
+                              profiling.PHASE_GRAPH_BUILD,
+                              profiling.PHASE_TOPOLOGICAL_SORT]),
+                         set(collector.phases))
+        # main blueprint and import
+        self.assertEqual(2, collector.phases[profiling.PHASE_LOAD_YAML].count)
+        # version extraction, imports and blueprint passes
+        self.assertEqual(
+            3, collector.phases[profiling.PHASE_CONTEXT_BUILD].count)
+        self.assertEqual([import_url], collector.imports.keys())
+        for stage in [profiling.STAGE_SCHEMA_VALIDATION,
+                      profiling.STAGE_VALIDATE,
+                      profiling.STAGE_PARSE,
+                      profiling.STAGE_CALCULATE_PROVIDED]:
+            self.assertEqual(
+                1, collector.element_stages[('NodeTemplates', stage)].count)
+
+        report = collector.report()
+        self.assertIn(import_url, report)
+        self.assertIn('NodeTemplates.parse', report)
+        stage_lines = report.split('element stages:\n')[1].splitlines()
+        totals = [float(line.split()[2])
+                  for line in stage_lines[:len(collector.element_stages)]]
+        self.assertEqual(sorted(totals, reverse=True), totals)
+
+    def test_interleaved_collectors(self):
+        original_deepcopy = copy.deepcopy
+        first = profiling.ProfilingCollector()
+        second = profiling.ProfilingCollector()
+        first.parse_started()
+        second.parse_started()
+        with profiling.observing(first), profiling.observing(second):
+            copy.deepcopy({})
+        first.parse_finished()
+        with profiling.observing(second):
+            copy.deepcopy({})
+        # not working on either parse
+        copy.deepcopy({})
+        other_thread = threading.Thread(target=copy.deepcopy, args=({},))
+        other_thread.start()
+        other_thread.join()
+        second.parse_finished()
+        self.assertIs(original_deepcopy, copy.deepcopy)
+        self.assertEqual(1, first.deepcopy_count)
+        self.assertEqual(2, second.deepcopy_count)
+
+    def test_deepcopy_count_with_executor(self):
+        self.make_file_with_name(content='content', filename='stub.py')
+        yaml_path = self.make_file_with_name(
+            filename='blueprint.yaml',
+            content=self.BASIC_VERSION_SECTION_DSL_1_0 + """
+plugins:
+    script:
+        executor: central_deployment_agent
+        install: false
+node_types:
+    test_type:
+        interfaces:
+            test:
+                op: stub.py
+node_templates:
+""" + ''.join("""
+    node{0}:
+        type: test_type
+        interfaces:
+            test:
+                op{0}: stub.py
+""".format(i) for i in range(4)))
+
+        def deepcopy_count(executor):
+            collector = profiling.ProfilingCollector()
+            parse_from_path(yaml_path, observer=collector, executor=executor)
+            return collector.deepcopy_count
+
+        pool = ThreadPool(4)
+        self.addCleanup(pool.terminate)
+        serial_count = deepcopy_count(None)
+        self.assertGreater(serial_count, 0)
+        self.assertEqual(serial_count, deepcopy_count(pool))
+
+    def test_observer_events(self):
+        events = []
+
+        class Observer(profiling.ParseObserver):
+            def parse_started(self):
+                events.append('started')
+
+            def parse_finished(self):
+                events.append('finished')
+
+            def phase_finished(self, phase, duration):
+                self.assert_duration(duration)
+                events.append(phase)
+
+            def import_fetched(self, import_url, duration):
+                self.assert_duration(duration)
+                events.append('import')
+
+            def assert_duration(self, duration):
+                if duration < 0:
+                    raise AssertionError(duration)
+
+        self._parse(Observer())
+        self.assertEqual('started', events[0])
+        self.assertEqual('finished', events[-1])
+        self.assertEqual(profiling.PHASE_LOAD_YAML, events[1])
+        self.assertEqual(1, events.count('import'))
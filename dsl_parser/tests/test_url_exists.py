@@ -0,0 +1,203 @@
+########
+# Copyright (c) 2015 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+#    * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    * See the License for the specific language governing permissions and
+#    * limitations under the License.
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import urllib
+from multiprocessing.pool import ThreadPool
+
+import mock
+import testtools
+
+from dsl_parser import (parser,
+                        utils)
+from dsl_parser.elements import operation
+from dsl_parser.holder import Holder
+
+RESOURCE_BASE = 'http://www.example.org/blueprint'
+
+
+class TestUrlExists(testtools.TestCase):
+
+    def _session(self, existing=(), latency=0):
+        requested_urls = []
+        lock = threading.Lock()
+
+        def head(url, **kwargs):
+            time.sleep(latency)
+            with lock:
+                requested_urls.append(url)
+            return mock.Mock(status_code=200 if url in existing else 404,
+                             ok=url in existing)
+
+        session = mock.Mock()
+        session.head.side_effect = head
+        return session, requested_urls
+
+    def test_file_url(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        file_path = os.path.join(temp_dir, 'script.sh')
+        open(file_path, 'w').close()
+        with mock.patch('urllib2.urlopen') as urlopen:
+            for path, exists in [(file_path, True),
+                                 (temp_dir, False),
+                                 (file_path + '.missing', False)]:
+                url = 'file:{0}'.format(urllib.pathname2url(path))
+                self.assertEqual(exists, utils.url_exists(url))
+            self.assertFalse(urlopen.called)
+
+    def test_existence_cache(self):
+        url = RESOURCE_BASE + '/script.sh'
+        session, requested_urls = self._session(existing=[url])
+        self.assertTrue(utils.url_exists(url, session))
+        self.assertTrue(utils.url_exists(url, session))
+        self.assertEqual(2, len(requested_urls))
+
+        with utils.url_existence_cache() as cache:
+            with utils.url_existence_cache() as nested_cache:
+                self.assertIs(cache, nested_cache)
+                self.assertTrue(utils.url_exists(url, session))
+            self.assertTrue(utils.url_exists(url, session))
+            self.assertEqual({url: True}, cache)
+        self.assertEqual(3, len(requested_urls))
+
+        self.assertTrue(utils.url_exists(url, session))
+        self.assertEqual(4, len(requested_urls))
+
+    def test_existence_cache_per_thread(self):
+        url = RESOURCE_BASE + '/script.sh'
+        session, requested_urls = self._session()
+        other_parse_started = threading.Event()
+        other_parse_finished = threading.Event()
+
+        def other_parse():
+            with utils.url_existence_cache():
+                utils.url_exists(url, session)
+                other_parse_started.set()
+                other_parse_finished.wait()
+
+        thread = threading.Thread(target=other_parse)
+        thread.start()
+        try:
+            other_parse_started.wait()
+            # the script is created while the other parse is still open
+            session, requested_urls = self._session(existing=[url])
+            with utils.url_existence_cache():
+                self.assertTrue(utils.url_exists(url, session))
+            self.assertEqual([url], requested_urls)
+        finally:
+            other_parse_finished.set()
+            thread.join()
+
+    def test_prefetch(self):
+        urls = ['{0}/script{1}.sh'.format(RESOURCE_BASE, i)
+                for i in range(8)]
+        session, requested_urls = self._session(existing=urls[:4],
+                                                latency=0.05)
+        head = session.head.side_effect
+        lock = threading.Lock()
+        in_flight = {'current': 0, 'peak': 0}
+
+        def tracking_head(url, **kwargs):
+            with lock:
+                in_flight['current'] += 1
+                in_flight['peak'] = max(in_flight['peak'],
+                                        in_flight['current'])
+            try:
+                return head(url, **kwargs)
+            finally:
+                with lock:
+                    in_flight['current'] -= 1
+
+        session.head.side_effect = tracking_head
+        with utils.url_existence_cache():
+            utils.prefetch_url_exists(urls + urls, session)
+            self.assertGreater(in_flight['peak'], 1)
+            self.assertEqual(sorted(urls), sorted(requested_urls))
+            self.assertEqual([True] * 4 + [False] * 4,
+                             [utils.url_exists(url, session)
+                              for url in urls])
+        self.assertEqual(8, len(requested_urls))
+
+    def test_prefetch_operation_resources(self):
+        blueprint = Holder.of({
+            'plugins': {'plugin': {}},
+            'node_types': {
+                'type': {
+                    'interfaces': {
+                        'test': {
+                            'op1': 'plugin.tasks.op',
+                            'op2': 'scripts/op2.sh',
+                            'op3': {'implementation': 'scripts/op3.sh'}}}}},
+            'node_templates': {
+                'node': {
+                    'relationships': [{
+                        'source_interfaces': {
+                            'test': {'op': 'scripts/op2.sh'}}}]}},
+            'workflows': {
+                'workflow1': 'plugin.workflow',
+                'workflow2': {'mapping': 'scripts/workflow.py'}}})
+        session, requested_urls = self._session()
+        with utils.url_existence_cache():
+            operation.prefetch_resource_exists(blueprint, RESOURCE_BASE,
+                                               session)
+        self.assertEqual(
+            sorted('{0}/scripts/{1}'.format(RESOURCE_BASE, name)
+                   for name in ['op2.sh', 'op3.sh', 'workflow.py']),
+            sorted(requested_urls))
+
+    def test_parse_with_executor_uses_parse_cache(self):
+        nodes = ''.join("""
+    node{0}:
+        type: type
+        interfaces:
+            test:
+                create: scripts/create.sh
+                delete: scripts/delete{1}.sh""".format(i, i % 2)
+                        for i in range(5))
+        yaml = """
+tosca_definitions_version: cloudify_dsl_1_0
+plugins:
+    script:
+        executor: central_deployment_agent
+        install: false
+node_types:
+    type: {}
+node_templates:""" + nodes
+        scripts = ['{0}/scripts/{1}'.format(RESOURCE_BASE, name)
+                   for name in ['create.sh', 'delete0.sh', 'delete1.sh']]
+        requested_urls = []
+        lock = threading.Lock()
+
+        def url_exists(url, session):
+            with lock:
+                requested_urls.append(url)
+            return url in scripts
+
+        pool = ThreadPool(4)
+        self.addCleanup(pool.terminate)
+        with mock.patch('dsl_parser.utils._url_exists',
+                        side_effect=url_exists):
+            plan = parser.ParseSession(executor=pool).parse(
+                yaml, dsl_location=RESOURCE_BASE + '/blueprint.yaml')
+        self.assertEqual(sorted(scripts), sorted(requested_urls))
+        self.assertEqual(
+            'scripts/delete1.sh',
+            [n for n in plan['nodes'] if n['id'] == 'node1'][0][
+                'operations']['delete']['inputs']['script_path'])
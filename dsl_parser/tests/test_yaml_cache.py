@@ -0,0 +1,116 @@
+########
+# Copyright (c) 2015 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+#    * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    * See the License for the specific language governing permissions and
+#    * limitations under the License.
+
+import os
+import shutil
+import tempfile
+
+import mock
+
+from dsl_parser import (utils,
+                        yaml_loader)
+from dsl_parser.parser import parse as dsl_parse
+from dsl_parser.yaml_cache import YamlCache
+from dsl_parser.tests.abstract_test_parser import AbstractTestParser
+from dsl_parser.tests.test_yaml_loader import _marked
+
+
+class TestYamlCache(AbstractTestParser):
+
+    YAML = """
+node_types:
+    test_type:
+        properties:
+            key: {default: [1, 2.5, true, null, x]}
+            set: {default: !!set {a, b}}
+"""
+
+    def setUp(self):
+        super(TestYamlCache, self).setUp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+
+    def _load(self, cache, raw_yaml):
+        return utils.load_yaml(raw_yaml, 'error', filename='file.yaml',
+                               cache=cache)
+
+    def test_cached_holders(self):
+        cache = YamlCache(self.cache_dir)
+        loaded = self._load(cache, self.YAML)
+        with mock.patch.object(yaml_loader, 'load') as load:
+            cached = self._load(cache, self.YAML)
+            self.assertFalse(load.called)
+        self.assertEqual(_marked(loaded), _marked(cached))
+        self.assertIsNot(loaded, cached)
+        self.assertEqual(1, len(os.listdir(self.cache_dir)))
+        self.assertIsNone(cache.get(self.YAML, 'other.yaml'))
+
+    def test_non_ascii_filename(self):
+        cache = YamlCache(self.cache_dir)
+        filename = u'd\xe9finitions.yaml'
+        loaded = utils.load_yaml(self.YAML, 'error', filename=filename,
+                                 cache=cache)
+        cached = cache.get(self.YAML, filename)
+        self.assertEqual(_marked(loaded), _marked(cached))
+        self.assertEqual(filename, cached.filename)
+        self.assertIsNone(cache.get(self.YAML, 'file.yaml'))
+
+    def test_not_cached_values(self):
+        cache = YamlCache(self.cache_dir)
+        loaded = self._load(cache, 'timestamp: 2015-01-01')
+        self.assertEqual(['timestamp'], loaded.restore().keys())
+        self.assertEqual([], os.listdir(self.cache_dir))
+
+    def test_invalid_entry(self):
+        cache = YamlCache(self.cache_dir)
+        self._load(cache, self.YAML)
+        entry, = os.listdir(self.cache_dir)
+        with open(os.path.join(self.cache_dir, entry), 'w') as f:
+            f.write('invalid')
+        self.assertIsNone(cache.get(self.YAML, 'file.yaml'))
+        self.assertEqual([], os.listdir(self.cache_dir))
+
+    def test_eviction(self):
+        cache = YamlCache(self.cache_dir, max_size=0)
+        self._load(cache, self.YAML)
+        self.assertEqual([], os.listdir(self.cache_dir))
+
+        cache.max_size = 1024 * 1024
+        first = self.YAML + 'first: 1'
+        second = self.YAML + 'second: 1'
+        self._load(cache, first)
+        self._load(cache, second)
+        first_path = cache._path(first, 'file.yaml')
+        second_path = cache._path(second, 'file.yaml')
+        os.utime(first_path, (1, 1))
+        os.utime(second_path, (2, 2))
+        cache.get(first, 'file.yaml')
+        cache.max_size = os.path.getsize(first_path)
+        cache._evict()
+        self.assertEqual([os.path.basename(first_path)],
+                         os.listdir(self.cache_dir))
+
+    def test_parse_with_cache(self):
+        imported = self.make_yaml_file(self.BASIC_PLUGIN + self.BASIC_TYPE)
+        dsl_string = self.BASIC_VERSION_SECTION_DSL_1_0 + """
+imports:
+    -   {0}
+""".format(imported) + self.BASIC_NODE_TEMPLATES_SECTION
+        cache = YamlCache(self.cache_dir)
+        plan = dsl_parse(dsl_string, yaml_cache=cache)
+        self.assertEqual(2, len(os.listdir(self.cache_dir)))
+        with mock.patch.object(yaml_loader, 'load') as load:
+            self.assertEqual(plan, dsl_parse(dsl_string, yaml_cache=cache))
+            self.assertFalse(load.called)
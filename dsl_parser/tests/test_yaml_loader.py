@@ -0,0 +1,88 @@
+########
+# Copyright (c) 2015 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+#    * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    * See the License for the specific language governing permissions and
+#    * limitations under the License.
+
+import testtools
+import yaml.parser
+
+from dsl_parser import yaml_loader
+
+
+def _marked(value):
+    if isinstance(value, tuple):
+        return tuple(_marked(v) for v in value)
+    raw = value.value
+    if isinstance(raw, dict):
+        raw = sorted((_marked(k), _marked(v)) for k, v in raw.iteritems())
+    elif isinstance(raw, (set, frozenset)):
+        raw = sorted(_marked(v) for v in raw)
+    elif isinstance(raw, list):
+        raw = [_marked(v) for v in raw]
+    return (raw, type(raw),
+            value.start_line, value.start_column,
+            value.end_line, value.end_column,
+            value.filename)
+
+
+@testtools.skipIf(yaml_loader.CMarkedLoader is None,
+                  'PyYAML is built without libyaml')
+class TestCMarkedLoader(testtools.TestCase):
+
+    YAML = u"""
+tosca_definitions_version: cloudify_dsl_1_2
+node_types:
+    test_type:
+        derived_from: cloudify.nodes.Root
+        properties:
+            key: {default: 'default', description: "d\xe9scription"}
+            list: {default: [1, 2.5, true, null, ~, 2015-01-01, x]}
+node_templates:
+    node:
+        type: test_type
+        properties:
+            key: &anchor
+                nested:
+                    -   a
+                    -   b: c
+            list: *anchor
+            literal: |
+                line1
+                line2
+            folded: >
+                folded
+                text
+            binary: !!binary aGVsbG8=
+            set: !!set {a, b}
+            omap: !!omap [{a: 1}, {b: 2}]
+            pairs: !!pairs [{a: 1}, {a: 2}]
+            empty:
+"""
+
+    def _load(self, loader_cls, stream):
+        return loader_cls(stream, 'blueprint.yaml').get_single_data()
+
+    def test_parity_with_pure_python_loader(self):
+        for stream in [self.YAML, self.YAML.encode('utf-8')]:
+            self.assertEqual(
+                _marked(self._load(yaml_loader.MarkedLoader, stream)),
+                _marked(self._load(yaml_loader.CMarkedLoader, stream)))
+
+    def test_load_uses_libyaml(self):
+        self.assertIs(yaml_loader.CMarkedLoader, yaml_loader.Loader)
+        result = yaml_loader.load('', 'blueprint.yaml')
+        self.assertEqual({}, result.value)
+
+    def test_parser_error(self):
+        self.assertRaises(yaml.parser.ParserError,
+                          self._load, yaml_loader.CMarkedLoader, 'a: [b')
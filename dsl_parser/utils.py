@@ -16,9 +16,15 @@
 import copy
 import contextlib
 import importlib
+import os
+import threading
+import urllib
 import urllib2
+import urlparse
 import sys
+from multiprocessing.pool import ThreadPool
 
+import requests
 import yaml.parser
 
 from dsl_parser import yaml_loader
@@ -29,9 +35,15 @@ from dsl_parser.constants import RESOLVER_IMPLEMENTATION_KEY, \
 from dsl_parser import exceptions
 from dsl_parser.exceptions import (DSLParsingLogicException,
                                    DSLParsingFormatException)
+from dsl_parser.import_resolver import abstract_import_resolver
 from dsl_parser.import_resolver.default_import_resolver import \
     DefaultImportResolver
 
+URL_EXISTS_THREADS = 8
+
+# the existence cache of the parse running in each thread
+_existence_local = threading.local()
+
 
 class ResolverInstantiationError(Exception):
     pass
@@ -69,7 +81,8 @@ def merge_schemas(overridden_schema,
                     path=[],
                     raise_on_missing_property=False)
                 if default_value:
-                    merged[key]['default'] = default_value
+                    merged[key] = dict(overriding_property,
+                                       default=default_value)
     return merged
 
 
@@ -81,6 +94,20 @@ def flatten_schema(schema):
     return flattened_schema_props
 
 
+def canonical_key(value):
+    """Returns a hashable key of ``value``, which is equal for equal
+    values."""
+    if isinstance(value, dict):
+        return dict, frozenset((key, canonical_key(item))
+                               for key, item in value.iteritems())
+    elif isinstance(value, list):
+        return list, tuple(canonical_key(item) for item in value)
+    elif isinstance(value, (set, frozenset)):
+        return set, frozenset(canonical_key(item) for item in value)
+    # the type tells apart equal values such as 1, 1.0 and True
+    return type(value), value
+
+
 def _property_description(path, name=None):
     if not path:
         return name
@@ -231,15 +258,100 @@ def parse_value(
             value))
 
 
-def load_yaml(raw_yaml, error_message, filename=None):
+def load_yaml(raw_yaml, error_message, filename=None, cache=None):
+    if cache is not None:
+        result = cache.get(raw_yaml, filename)
+        if result is not None:
+            return result
     try:
-        return yaml_loader.load(raw_yaml, filename)
-    except yaml.parser.ParserError, ex:
+        result = yaml_loader.load(raw_yaml, filename)
+    except yaml.YAMLError, ex:
         raise DSLParsingFormatException(-1, '{0}: Illegal yaml; {1}'
                                         .format(error_message, ex))
+    if cache is not None:
+        cache.put(raw_yaml, filename, result)
+    return result
+
 
+@contextlib.contextmanager
+def url_existence_cache():
+    """Caches the results of ``url_exists`` calls made in this thread until
+    the outermost ``url_existence_cache`` block of the thread exits.
 
-def url_exists(url):
+    Yields the cache, which other threads working for the same parse pass
+    to ``url_exists`` explicitly.
+    """
+    cache = current_url_existence_cache()
+    if cache is not None:
+        yield cache
+        return
+    cache = _existence_local.cache = {}
+    try:
+        yield cache
+    finally:
+        _existence_local.cache = None
+
+
+def current_url_existence_cache():
+    """Returns the existence cache open in this thread, or None."""
+    return getattr(_existence_local, 'cache', None)
+
+
+def url_exists(url, session=None, cache=None):
+    if cache is None:
+        cache = current_url_existence_cache()
+    if cache is None:
+        return _url_exists(url, session)
+    exists = cache.get(url)
+    if exists is None:
+        exists = cache[url] = _url_exists(url, session)
+    return exists
+
+
+def prefetch_url_exists(urls, session=None, cache=None):
+    """Checks whether the HTTP(S) ``urls`` exist with concurrent requests,
+    so that ``url_exists`` finds them in the existence ``cache`` (by
+    default, the one open in this thread)."""
+    if cache is None:
+        cache = current_url_existence_cache()
+    if cache is None:
+        return
+    urls = [url for url in set(urls)
+            if url and url not in cache and
+            url.split(':')[0] in ['http', 'https']]
+    if len(urls) < 2:
+        return
+    pool = ThreadPool(min(URL_EXISTS_THREADS, len(urls)))
+    try:
+        pool.map(lambda url: url_exists(url, session, cache), urls)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _url_exists(url, session):
+    scheme = url.split(':')[0]
+    if scheme == 'file':
+        parts = urlparse.urlsplit(url)
+        if parts.netloc in ['', 'localhost']:
+            return os.path.isfile(urllib.url2pathname(parts.path))
+    if scheme in ['http', 'https']:
+        # checked through a pooled session, connections to the resource
+        # server are reused across checks and imports
+        session = session or abstract_import_resolver.get_default_session()
+        try:
+            response = session.head(
+                url, allow_redirects=True,
+                timeout=abstract_import_resolver.DEFAULT_REQUEST_TIMEOUT)
+            if response.status_code in (405, 501):
+                # HEAD is not supported by the server
+                response = session.get(
+                    url, stream=True,
+                    timeout=abstract_import_resolver.DEFAULT_REQUEST_TIMEOUT)
+                response.close()
+        except requests.RequestException:
+            return False
+        return response.ok
     try:
         with contextlib.closing(urllib2.urlopen(url)):
             return True
@@ -247,6 +359,56 @@ def url_exists(url):
         return False
 
 
+def dsl_location_to_url(dsl_location, resources_base_url):
+    if dsl_location is not None:
+        dsl_location = get_resource_location(dsl_location, resources_base_url)
+        if dsl_location is None:
+            ex = DSLParsingLogicException(
+                30, "Failed converting dsl "
+                    "location to url: no suitable "
+                    "location found "
+                    "for dsl '{0}'"
+                    .format(dsl_location))
+            ex.failed_import = dsl_location
+            raise ex
+    return dsl_location
+
+
+def get_resource_location(resource_name,
+                          resources_base_url,
+                          current_resource_context=None,
+                          session=None,
+                          existence_cache=None):
+    url_parts = resource_name.split(':')
+    if url_parts[0] in ['http', 'https', 'file', 'ftp']:
+        return resource_name
+
+    if os.path.exists(resource_name):
+        return 'file:{0}'.format(
+            urllib.pathname2url(os.path.abspath(resource_name)))
+
+    candidate_url = relative_candidate_url(resource_name,
+                                           current_resource_context)
+    if candidate_url and url_exists(candidate_url, session,
+                                    existence_cache):
+        return candidate_url
+
+    if resources_base_url:
+        return resources_base_url + resource_name
+
+    return None
+
+
+def relative_candidate_url(resource_name, current_resource_context):
+    url_parts = resource_name.split(':')
+    if url_parts[0] in ['http', 'https', 'file', 'ftp'] or \
+            not current_resource_context or \
+            os.path.exists(resource_name):
+        return None
+    return current_resource_context[
+        :current_resource_context.rfind('/') + 1] + resource_name
+
+
 def create_import_resolver(resolver_configuration):
     if resolver_configuration:
         resolver_class_path = resolver_configuration.get(
@@ -0,0 +1,128 @@
+########
+# Copyright (c) 2015 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+#    * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    * See the License for the specific language governing permissions and
+#    * limitations under the License.
+
+import errno
+import hashlib
+import marshal
+import os
+import tempfile
+
+from dsl_parser import holder
+
+# bump when the serialized format changes so old entries are not used
+_FORMAT_VERSION = 2
+_TEMP_PREFIX = '.tmp-'
+
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+
+
+class YamlCache(object):
+    """Persistent cache of loaded YAML documents.
+
+    Loaded holder trees are stored in ``cache_dir``, one file per
+    document, keyed by the sha256 of the document content and its file
+    name. Entries are written to a temporary
+    file that is then renamed into place, so several processes can share
+    the same directory. Once the total size of the entries exceeds
+    ``max_size`` bytes, the least recently used ones are removed.
+
+    Documents containing values that cannot be serialized (such as
+    timestamps) are not cached.
+
+    Entries are serialized with ``marshal``, which is not secure against
+    maliciously constructed data, so ``cache_dir`` must be trusted: it
+    should only be writable by the processes using the cache.
+    """
+
+    def __init__(self, cache_dir, max_size=DEFAULT_MAX_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        try:
+            os.makedirs(cache_dir)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+    def get(self, raw_yaml, filename=None):
+        """Returns the cached holder tree or None if it is not cached."""
+        path = self._path(raw_yaml, filename)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path, None)
+        except (IOError, OSError):
+            return None
+        try:
+            return holder.from_primitive(marshal.loads(data), filename)
+        except (EOFError, ValueError, TypeError):
+            # not written by this version
+            _remove(path)
+            return None
+
+    def put(self, raw_yaml, filename, loaded):
+        try:
+            data = marshal.dumps(holder.to_primitive(loaded), 2)
+        except ValueError:
+            return
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir,
+                                         prefix=_TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.rename(temp_path, self._path(raw_yaml, filename))
+        except (IOError, OSError):
+            _remove(temp_path)
+            return
+        self._evict()
+
+    def _path(self, raw_yaml, filename):
+        key = hashlib.sha256()
+        if isinstance(filename, unicode):
+            filename = filename.encode('utf-8')
+        key.update('{0}\0{1}\0'.format(_FORMAT_VERSION, filename))
+        if isinstance(raw_yaml, unicode):
+            raw_yaml = raw_yaml.encode('utf-8')
+        key.update(raw_yaml)
+        return os.path.join(self.cache_dir, key.hexdigest())
+
+    def _evict(self):
+        entries = []
+        total_size = 0
+        for name in os.listdir(self.cache_dir):
+            if name.startswith(_TEMP_PREFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # removed by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+        if total_size <= self.max_size:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            _remove(path)
+            total_size -= size
+            if total_size <= self.max_size:
+                break
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -19,6 +19,11 @@ from yaml.composer import Composer
 from yaml.resolver import Resolver
 from yaml.parser import Parser
 from yaml.constructor import SafeConstructor
+try:
+    from yaml.cyaml import CParser
+except ImportError:
+    # PyYAML built without libyaml
+    CParser = None
 
 from dsl_parser import holder
 
@@ -145,8 +150,23 @@ class MarkedLoader(Reader, Scanner, Parser, Composer, HolderConstructor,
         Resolver.__init__(self)
 
 
+if CParser is not None:
+    class CMarkedLoader(CParser, HolderConstructor, Resolver):
+        """libyaml backed equivalent of ``MarkedLoader``."""
+
+        def __init__(self, stream, filename=None):
+            CParser.__init__(self, stream)
+            HolderConstructor.__init__(self, filename)
+            Resolver.__init__(self)
+
+    Loader = CMarkedLoader
+else:
+    CMarkedLoader = None
+    Loader = MarkedLoader
+
+
 def load(stream, filename):
-    result = MarkedLoader(stream, filename).get_single_data()
+    result = Loader(stream, filename).get_single_data()
     if result is None:
         # load of empty string returns None so we convert it to an empty
         # dict